@@ -3,7 +3,8 @@ Deduplication cache with TTL support.
 Prevents duplicate alerts within time window.
 """
 import time
-from typing import Dict, Optional
+from collections import OrderedDict
+from typing import Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -14,6 +15,7 @@ class DeduplicationCache:
     Time-based deduplication cache.
     
     Stores dedup keys with timestamps and expires them after TTL.
+    Entries are kept in insertion order, so expiry only looks at the oldest ones.
     Thread-safe for single-threaded async usage.
     """
     
@@ -24,15 +26,15 @@ class DeduplicationCache:
         Args:
             ttl_seconds: Time-to-live for cache entries (default 5 minutes)
         """
-        self._cache: Dict[str, float] = {}
+        self._cache: OrderedDict[str, float] = OrderedDict()
         self._ttl = ttl_seconds
     
     def _cleanup(self) -> None:
         """Remove expired entries."""
         now = time.time()
-        expired = [k for k, v in self._cache.items() if now - v > self._ttl]
-        for k in expired:
-            del self._cache[k]
+        cache = self._cache
+        while cache and now - next(iter(cache.values())) > self._ttl:
+            cache.popitem(last=False)
     
     def is_duplicate(self, key: str) -> bool:
         """
@@ -65,6 +67,7 @@ class DeduplicationCache:
         """
         if key:
             self._cache[key] = time.time()
+            self._cache.move_to_end(key)
             logger.debug(f"Added to cache: {key}")
     
     def check_and_add(self, key: str) -> bool:
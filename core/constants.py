@@ -4,6 +4,7 @@ Single source of truth for geographic data.
 """
 
 from enum import Enum
+from functools import lru_cache
 
 
 class ThreatType(Enum):
@@ -20,24 +21,27 @@ class ThreatType(Enum):
     @classmethod
     def from_string(cls, s: str) -> 'ThreatType':
         """Parse threat type from various string formats."""
-        s_lower = s.lower()
-        
-        if any(x in s_lower for x in ['розвідк', 'розвідувальн', 'розвідувальний бпла', 'бпла-розвідник']):
-            return cls.RECON
-        if any(x in s_lower for x in ['бпла', 'шахед', 'герань', 'мопед', 'балалайк', 'drone']):
-            return cls.BPLA
-        if any(x in s_lower for x in ['ракет', 'калібр', 'cruise', 'крилат']):
-            return cls.ROCKET
-        if any(x in s_lower for x in ['каб', 'kab', 'бомб']):
-            return cls.KAB
-        if any(x in s_lower for x in ['баліст', 'ballistic', 'iskander']):
-            return cls.BALLISTIC
-        if any(x in s_lower for x in ['вибух', 'explosi', '💥']):
-            return cls.EXPLOSION
-        if any(x in s_lower for x in ['пуск', 'пуски']):
-            return cls.LAUNCH
-        
-        return cls.UNKNOWN
+        return _parse_threat_type(s.lower())
+
+
+# Keyword table for ThreatType.from_string, checked in priority order
+_THREAT_TYPE_KEYWORDS = (
+    (ThreatType.RECON, ('розвідк', 'розвідувальн', 'розвідувальний бпла', 'бпла-розвідник')),
+    (ThreatType.BPLA, ('бпла', 'шахед', 'герань', 'мопед', 'балалайк', 'drone')),
+    (ThreatType.ROCKET, ('ракет', 'калібр', 'cruise', 'крилат')),
+    (ThreatType.KAB, ('каб', 'kab', 'бомб')),
+    (ThreatType.BALLISTIC, ('баліст', 'ballistic', 'iskander')),
+    (ThreatType.EXPLOSION, ('вибух', 'explosi', '💥')),
+    (ThreatType.LAUNCH, ('пуск', 'пуски')),
+)
+
+
+@lru_cache(maxsize=256)
+def _parse_threat_type(s_lower: str) -> ThreatType:
+    for threat_type, keywords in _THREAT_TYPE_KEYWORDS:
+        if any(x in s_lower for x in keywords):
+            return threat_type
+    return ThreatType.UNKNOWN
 
 # Standard region format: "Назва обл."
 REGIONS = {
@@ -127,6 +131,9 @@ REGION_ALIASES = {
     'Кіровоградщину': 'Кіровоградська обл.', 'Кіровоградська область': 'Кіровоградська обл.',
 }
 
+# Same aliases keyed by lowercase text, for case-insensitive lookups
+REGION_ALIASES_LOWER = {alias.lower(): region for alias, region in REGION_ALIASES.items()}
+
 # City -> Region mapping (oblast centers and major cities)
 CITIES = {
     # Oblast centers
@@ -223,6 +230,92 @@ CITIES = {
 # Lowercased city -> region (fast lookup)
 CITY_TO_REGION = {city.lower(): region for city, region in CITIES.items()}
 
+# Nominative ending -> (replacement, oblique endings): genitive/accusative/locative
+# forms as they appear in posts ("на Харків", "біля Харкова", "у Харкові")
+_OBLIQUE_ENDINGS = (
+    ('ий', '', ('ого', 'ому')),               # Хмельницький -> Хмельницького
+    ('чів', 'чев', ('а', 'і')),               # Золочів -> Золочева, Золочеві
+    ('ів', 'ов', ('а', 'і')),                 # Харків -> Харкова, Харкові
+    ('їв', 'єв', ('а', 'і')),                 # Київ -> Києва
+    ('іль', 'ол', ('я', 'і')),                # Тернопіль -> Тернополя
+    ('ець', 'ц', ('я', 'і')),                 # Марганець -> Марганця
+    ('ь', '', ('я', 'і')),                    # Маріуполь -> Маріуполя
+    ('ова', 'ов', ('ої', 'у', 'ій')),          # Лозова -> Лозової
+    ('ка', '', ('ки', 'ку', 'ці')),           # Софіївка -> Софіївки, Софіївці
+    ('а', '', ('и', 'у', 'і')),               # Полтава -> Полтави
+    ('ія', '', ('ії', 'ію')),                 # Балаклія -> Балаклії
+    ('я', '', ('і', 'ю')),                    # Вінниця -> Вінниці
+    ('е', '', ('ого', 'ому')),                # Синельникове -> Синельникового
+    ('о', '', ('а', 'і')),                    # Дніпро -> Дніпра
+)
+
+# Names that do not follow the ending rules above
+_OBLIQUE_EXCEPTIONS = {
+    'канів': ('канева', 'каневі'),
+    'умань': ('умані',),                              # feminine
+    'просяна': ('просяної', 'просяну', 'просяній'),   # adjective
+}
+
+# Generated forms that are ordinary words in posts: the river Dnipro, "затоку" (bay),
+# "лісного" (forest), Russian "южного" (southern), "коропа" (carp), and the adjective
+# in hromada and street names ("Первомайська громада")
+_OBLIQUE_STOPWORDS = frozenset({
+    'дніпра', 'дніпрі', 'затоки', 'затоку', 'затоці', 'лісного', 'лісному', 'южного', 'южному',
+    'коропа', 'коропі', 'первомайська', 'первомайську',
+})
+
+
+def _region_words() -> set:
+    """Region aliases and region adjectives in all cases ("донецька", "донецьку", ...)."""
+    words = set(REGION_ALIASES_LOWER)
+    for region in REGIONS:
+        adjective = region.split()[0].lower()
+        if adjective.endswith('ька'):
+            stem = adjective[:-1]
+            words.update((adjective, stem + 'ої', stem + 'у', stem + 'ій'))
+    return words
+
+
+def _oblique_forms(city: str):
+    """Oblique case forms of a lowercased single-word city name."""
+    if city in _OBLIQUE_EXCEPTIONS:
+        return _OBLIQUE_EXCEPTIONS[city]
+    if ' ' in city or '-' in city or city[-1] in 'иі':
+        return ()  # multi-word, compound and plural names decline irregularly
+    for ending, stem, endings in _OBLIQUE_ENDINGS:
+        if city.endswith(ending):
+            base = city[:-len(ending)] + stem
+            return tuple(base + e for e in endings)
+    # Consonant ending: Херсон -> Херсона, Херсоні; Покровськ -> Покровська, Покровську
+    if city.endswith('ськ') or city.endswith('цьк'):
+        return (city + 'а', city + 'у')
+    if city[-1] in 'кгх':
+        return (city + 'а',)  # locative alternates the consonant (Кременчуці)
+    return (city + 'а', city + 'і')
+
+
+def _build_city_forms() -> dict:
+    forms = {}
+    ambiguous = set()
+    for city, region in CITIES.items():
+        entry = (city, region)
+        for form in _oblique_forms(city.lower()):
+            if forms.setdefault(form, entry) != entry:
+                ambiguous.add(form)
+    for form in ambiguous | (_OBLIQUE_STOPWORDS | _region_words()) & forms.keys():
+        del forms[form]
+    # Nominative names always win
+    forms.update((city.lower(), (city, region)) for city, region in CITIES.items())
+    return forms
+
+
+# Lowercased city in nominative or oblique case -> (CITIES name, region), built once at import
+CITY_FORMS = _build_city_forms()
+
+# Typographic apostrophes as used in Telegram posts -> ASCII (as in CITIES)
+APOSTROPHES = str.maketrans({'ʼ': "'", '’': "'", '`': "'"})
+
+
 # Channel -> default region (for regional channels)
 CHANNEL_REGIONS = {
     'odessaveter': 'Одеська обл.',
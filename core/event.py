@@ -10,7 +10,7 @@ import hashlib
 from core.constants import ThreatType, REGIONS
 
 
-@dataclass
+@dataclass(slots=True)
 class Event:
     """
     Unified event model for all threat types.
@@ -5,15 +5,17 @@ Routes messages through normalization -> extraction -> classification -> dedup -
 import asyncio
 import logging
 import re
+import time
 from typing import List, Optional
 
 from .telegram_client import TelegramIngestClient, IncomingMessage
 from core.event import Event, ThreatType
 from core.cache import DeduplicationCache
-from parsers.routing import route_message
-from utils.geo import geocode_city
+from parsers.routing import route_normalized
+from parsers.entity_extraction import HEADER_PREFIX_CHARS
+from utils.geo import geocode_city, get_region_for_city, close_session, flush_cache
 from parsers.classification import validate_city_region
-from core.constants import REGION_ALIASES
+from core.constants import REGION_ALIASES_LOWER, CHANNEL_REGIONS
 from parsers.normalize import normalize_text
 from parsers.patterns import PATTERNS
 
@@ -24,20 +26,36 @@ try:
 except ImportError:
     get_metrics = None
 
+# Bound once; the metrics singleton never changes
+_metrics = get_metrics() if get_metrics else None
+
 
 async def _enrich_regions(events: list) -> None:
-    """Enrich events with missing region via parallel geocoding."""
-    to_enrich = [(i, e) for i, e in enumerate(events) if e.city and not e.region]
+    """Enrich events with missing region via parallel geocoding (one lookup per city)."""
+    to_enrich = [e for e in events if e.city and not e.region]
     if not to_enrich:
         return
-    indices, evts = zip(*to_enrich)
-    tasks = [geocode_city(e.city) for e in evts]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-    for idx, result in zip(indices, results):
+    resolved = {}
+    misses = []
+    for city in dict.fromkeys(e.city for e in to_enrich):
+        # Local dictionary / cache hits resolve inline; only misses go to the geocoders
+        region = get_region_for_city(city)
+        if region:
+            resolved[city] = region
+            if _metrics:
+                _metrics.geocode_cache_hit += 1
+        else:
+            misses.append(city)
+    results = await asyncio.gather(*(geocode_city(c) for c in misses), return_exceptions=True)
+    for city, result in zip(misses, results):
         if isinstance(result, Exception):
-            logger.debug(f"Geocode failed for {events[idx].city}: {result}")
+            logger.debug(f"Geocode failed for {city}: {result}")
         elif result:
-            events[idx].region = result
+            resolved[city] = result
+    for event in to_enrich:
+        region = resolved.get(event.city)
+        if region:
+            event.region = region
 
 
 INFO_ATTACK_KEYWORDS = (
@@ -54,6 +72,25 @@ AIRCRAFT_KEYWORDS = (
     'бомбардувальник', 'стратегічн', 'з аеродрома', 'з аеродрому'
 )
 
+# Single-pass matchers over lowercased text
+_INFO_ATTACK_RE = re.compile('|'.join(map(re.escape, INFO_ATTACK_KEYWORDS)))
+_NEUTRALIZED_RE = re.compile('|'.join(map(re.escape, NEUTRALIZED_KEYWORDS)))
+_AIRCRAFT_RE = re.compile('|'.join(map(re.escape, AIRCRAFT_KEYWORDS)))
+_CITY_ONLY_RE = re.compile(r'^\W*[А-ЯІЇЄҐа-яіїєґ\'\-]+\W*$')
+_CYRILLIC_WORD_RE = re.compile(r'[А-ЯІЇЄҐа-яіїєґ]{3,}')
+# Without a threat keyword or channel region, a rule can only fire on one of these:
+# region in parens/headers ("обл", "-щина", aliases), "Особлива увага", "Група КР", "Баллістика"
+_TOPIC_RE = re.compile('|'.join(map(re.escape, (
+    'обл', 'щин', 'ччин', 'особлива', 'груп', 'балліст',
+    *REGION_ALIASES_LOWER,
+))))
+
+# Messages waiting for processing, per source channel; when full, intake waits
+PROCESS_QUEUE_SIZE = 100
+
+# Reconnect delay starts at poll_interval and doubles on each quick disconnect, up to this factor
+RECONNECT_BACKOFF_MAX = 8
+
 
 class MessageDispatcher:
     """
@@ -75,8 +112,6 @@ class MessageDispatcher:
         self.telegram = telegram_client
         self.cache = DeduplicationCache(ttl_seconds=dedup_ttl)
         self.raw_cache = DeduplicationCache(ttl_seconds=120)
-        self._normalize_cache = {}
-        self._normalize_cache_order = []
         
         self._processed_count = 0
         self._sent_count = 0
@@ -96,30 +131,29 @@ class MessageDispatcher:
         
         logger.debug(f"Processing message from @{message.channel}")
         
-        # 1. Normalize text with small cache
-        cache_key = f"{message.channel}:{message.id}"
-        normalized = self._normalize_cache.get(cache_key)
-        if normalized is None:
-            normalized = normalize_text(message.text)
-            self._normalize_cache[cache_key] = normalized
-            self._normalize_cache_order.append(cache_key)
-            if len(self._normalize_cache_order) > 512:
-                old_key = self._normalize_cache_order.pop(0)
-                self._normalize_cache.pop(old_key, None)
+        # 1. Normalize text (memoized by text, so reposts across channels are free)
+        normalized = normalize_text(message.text)
+
+        # 1.0. Skip messages without Ukrainian words (URL dumps, emoji, English notices)
+        if not _CYRILLIC_WORD_RE.search(normalized):
+            if _metrics:
+                _metrics.prefilter_skipped += 1
+            logger.debug("Non-Cyrillic message skipped")
+            return 0
         normalized_lower = normalized.lower()
 
         # 1.0. Skip informational/planned messages
-        if any(k in normalized_lower for k in INFO_ATTACK_KEYWORDS):
+        if _INFO_ATTACK_RE.search(normalized_lower):
             logger.debug("Informational planned attack message skipped")
             return 0
 
         # 1.0. Skip neutralized targets (good news)
-        if any(k in normalized_lower for k in NEUTRALIZED_KEYWORDS):
+        if _NEUTRALIZED_RE.search(normalized_lower):
             logger.debug("Neutralized target message skipped")
             return 0
 
         # 1.0. Skip aircraft status messages
-        if any(k in normalized_lower for k in AIRCRAFT_KEYWORDS):
+        if _AIRCRAFT_RE.search(normalized_lower):
             logger.debug("Aircraft status message skipped")
             return 0
 
@@ -130,31 +164,35 @@ class MessageDispatcher:
             return 0
 
         # 2. Skip alert-only messages without threat keywords
-        is_alert = PATTERNS.skip['alerts'].search(normalized) or PATTERNS.skip['shelter'].search(normalized)
-        has_threat = (
-            PATTERNS.threat_type.match_any(normalized)
-            or PATTERNS.launch['keywords'].search(normalized)
-        )
+        is_alert = PATTERNS.gate['alert'].search(normalized_lower)
+        has_threat = PATTERNS.gate['threat'].search(normalized_lower)
         if is_alert and not has_threat:
             logger.debug("Alert/shelter message skipped")
             return 0
 
+        # Skip off-topic messages that no rule can turn into an event
+        if (not has_threat and message.channel not in CHANNEL_REGIONS
+                and not _TOPIC_RE.search(normalized_lower)):
+            if _metrics:
+                _metrics.prefilter_skipped += 1
+            logger.debug("Off-topic message skipped")
+            return 0
+
         # Skip city-only messages without threat keywords
-        if not has_threat and re.match(r'^\W*[А-ЯІЇЄҐа-яіїєґ\'\-]+\W*$', normalized):
+        if not has_threat and _CITY_ONLY_RE.match(normalized):
             logger.debug("City-only message skipped (no threat)")
             return 0
 
-        # 2. Parse message into events
-        events = route_message(message.text, message.channel)
-        if get_metrics:
-            get_metrics().events_parsed += len(events)
+        # 2. Parse message into events (already normalized and gated above)
+        events = route_normalized(normalized, message.channel, message.text)
+        if _metrics:
+            _metrics.events_parsed += len(events)
 
         # 2.5. Enrich events with empty region via geocode (cache + API) - parallel
         await _enrich_regions(events)
 
         # 3. Local validation on parsed events (skip if header region exists)
-        header_region = _detect_region_header(normalized)
-        if events and not header_region:
+        if events and not _detect_region_header(normalized):
             for event in events:
                 if event.city and event.region:
                     corrected = validate_city_region(event.city, event.region)[1]
@@ -168,8 +206,8 @@ class MessageDispatcher:
             logger.debug("No valid events found")
             return 0
         
-        # 5. Deduplicate and send
-        sent = 0
+        # 5. Deduplicate and format
+        outgoing = []
         for event in events:
             # Check deduplication
             if self.cache.check_and_add(event.dedup_key):
@@ -177,52 +215,140 @@ class MessageDispatcher:
                 logger.info(f"Duplicate skipped: {event.dedup_key} (age: {age}s)")
                 continue
             
-            # Format and send
             formatted = event.format_message()
-            if not formatted:
-                continue
-            
-            # Send with media only for first message
-            media = message.raw_message.media if sent == 0 and message.has_media else None
-            
-            if await self.telegram.send_message(formatted, media):
+            if formatted:
+                outgoing.append(formatted)
+        
+        # 6. Send in order; only the first alert carries the media
+        results = []
+        media = message.raw_message.media if message.has_media else None
+        for formatted in outgoing:
+            results.append(await self.telegram.send_message(formatted, media))
+            media = None
+        sent = 0
+        for formatted, ok in zip(outgoing, results):
+            if ok:
                 sent += 1
-                if get_metrics:
-                    get_metrics().events_sent += 1
+                if _metrics:
+                    _metrics.events_sent += 1
                 logger.info(f"Sent: {formatted}")
-                await asyncio.sleep(0.5)  # Rate limiting
         
         self._processed_count += 1
         self._sent_count += sent
         
         return sent
 
+    async def _process_worker(self, queue: asyncio.Queue):
+        """Drain queued messages so slow processing never stalls polling."""
+        while True:
+            message = await queue.get()
+            try:
+                sent = await self.process_message(message)
+                if sent:
+                    logger.info(f"Processed @{message.channel}: {sent} alerts sent")
+            except Exception as e:
+                logger.error(f"Error processing message: {e}")
+            finally:
+                queue.task_done()
+
+    async def _enqueue(self, workers: dict, message: IncomingMessage):
+        """
+        Queue message for its channel's worker (started on first use).
+        
+        One worker per channel keeps each channel's alerts in order. A full
+        queue makes intake wait rather than drop: offsets are already past it,
+        so messages still queued when the process stops are not fetched again.
+        """
+        entry = workers.get(message.channel)
+        if entry is None:
+            queue: asyncio.Queue = asyncio.Queue(maxsize=PROCESS_QUEUE_SIZE)
+            worker = asyncio.create_task(self._process_worker(queue))
+            entry = workers[message.channel] = (queue, worker)
+        await entry[0].put(message)
+
+    @staticmethod
+    async def _stop_workers(workers: dict):
+        tasks = [worker for _, worker in workers.values()]
+        for worker in tasks:
+            worker.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
     async def run_polling_loop(self):
         """
-        Main polling loop - check for new messages and process them.
+        Main polling loop - check for new messages and queue them for processing.
         """
         logger.info(f"Starting polling loop (interval: {self.telegram.poll_interval}s)")
         
-        while True:
+        workers: dict = {}  # channel -> (queue, worker task)
+        
+        try:
+            while True:
+                try:
+                    async for message in self.telegram.poll_new_messages():
+                        await self._enqueue(workers, message)
+                    
+                    await asyncio.sleep(self.telegram.poll_interval)
+                    
+                except asyncio.CancelledError:
+                    logger.info("Polling loop cancelled")
+                    if _metrics:
+                        _metrics.log()
+                    break
+                except Exception as e:
+                    logger.error(f"Polling loop error: {e}")
+                    await asyncio.sleep(self.telegram.poll_interval)
+        finally:
+            await self._stop_workers(workers)
+
+    async def run_event_loop(self):
+        """
+        Event mode - receive new messages as Telegram push updates instead of polling.
+        
+        Poll once at startup to catch up on messages posted since the saved offsets,
+        and again after each reconnect if the connection drops.
+        """
+        logger.info("Starting event loop (push updates)")
+        
+        workers: dict = {}  # channel -> (queue, worker task)
+        
+        async def _on_message(message: IncomingMessage):
+            await self._enqueue(workers, message)
+        
+        self.telegram.add_message_handler(_on_message)
+        try:
             try:
                 async for message in self.telegram.poll_new_messages():
-                    try:
-                        sent = await self.process_message(message)
-                        if sent:
-                            logger.info(f"Processed @{message.channel}: {sent} alerts sent")
-                    except Exception as e:
-                        logger.error(f"Error processing message: {e}")
-                
-                await asyncio.sleep(self.telegram.poll_interval)
-                
-            except asyncio.CancelledError:
-                logger.info("Polling loop cancelled")
-                if get_metrics:
-                    get_metrics().log()
-                break
+                    await self._enqueue(workers, message)
             except Exception as e:
-                logger.error(f"Polling loop error: {e}")
-                await asyncio.sleep(self.telegram.poll_interval)
+                logger.error(f"Catch-up at startup failed: {e}")
+            backoff = 1
+            while True:
+                connected_at = time.monotonic()
+                try:
+                    await self.telegram.run_until_disconnected()
+                    logger.warning("Disconnected from Telegram, reconnecting")
+                except Exception as e:
+                    # Raised once Telethon's own reconnect attempts give up
+                    logger.error(f"Event loop error: {e}, reconnecting")
+                delay = self.telegram.poll_interval * backoff
+                if time.monotonic() - connected_at > delay * 2:
+                    # Connection stayed up for a while: start over with the short delay
+                    backoff = 1
+                    delay = self.telegram.poll_interval
+                await asyncio.sleep(delay)
+                backoff = min(backoff * 2, RECONNECT_BACKOFF_MAX)
+                try:
+                    if await self.telegram.ensure_connected():
+                        async for message in self.telegram.poll_new_messages():
+                            await self._enqueue(workers, message)
+                except Exception as e:
+                    logger.error(f"Catch-up after disconnect failed: {e}")
+        except asyncio.CancelledError:
+            logger.info("Event loop cancelled")
+            if _metrics:
+                _metrics.log()
+        finally:
+            await self._stop_workers(workers)
 
     @property
     def stats(self) -> dict:
@@ -239,13 +365,14 @@ def _detect_region_header(text: str) -> Optional[str]:
     if not text:
         return None
     for line in text.split('\n'):
-        clean = line.strip().lstrip('✈️🛵🛸⚠️❗️🔴📡 ').strip()
+        clean = line.lstrip(HEADER_PREFIX_CHARS).strip()
         if not clean:
             continue
         if clean.endswith(':'):
             clean = clean[:-1].strip()
-        if clean in REGION_ALIASES:
-            return REGION_ALIASES[clean]
+        region = REGION_ALIASES_LOWER.get(clean.lower())
+        if region:
+            return region
         if 'област' in clean.lower():
             return clean.replace(' область', ' обл.').replace(' Область', ' обл.')
     return None
@@ -260,7 +387,9 @@ async def create_and_run_dispatcher(
     sources: List[str],
     target: str,
     poll_interval: int = 30,
-    dedup_ttl: int = 300
+    dedup_ttl: int = 300,
+    mode: str = 'poll',
+    offsets_file: Optional[str] = None
 ) -> None:
     """
     Create dispatcher and run main loop.
@@ -274,7 +403,8 @@ async def create_and_run_dispatcher(
         session_string=session,
         source_channels=sources,
         target_channel=target,
-        poll_interval=poll_interval
+        poll_interval=poll_interval,
+        offsets_file=offsets_file
     )
     
     # Connect
@@ -283,10 +413,14 @@ async def create_and_run_dispatcher(
     
     # Validate channels
     valid_sources, target_entity = await client.validate_channels()
+    await client.seed_last_message_ids()
     
     logger.info(f"Monitoring {len(valid_sources)} channels")
     logger.info(f"Target: @{target}")
-    logger.info(f"Poll interval: {poll_interval}s")
+    if mode == 'events':
+        logger.info("Ingest mode: events")
+    else:
+        logger.info(f"Poll interval: {poll_interval}s")
     
     # Create dispatcher
     dispatcher = MessageDispatcher(
@@ -296,6 +430,11 @@ async def create_and_run_dispatcher(
     
     # Run
     try:
-        await dispatcher.run_polling_loop()
+        if mode == 'events':
+            await dispatcher.run_event_loop()
+        else:
+            await dispatcher.run_polling_loop()
     finally:
+        await flush_cache()
+        await close_session()
         await client.disconnect()
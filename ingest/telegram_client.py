@@ -3,18 +3,39 @@ Telegram client wrapper for message ingestion.
 Handles connection, polling, and message retrieval.
 """
 import asyncio
+import json
 import logging
-from typing import List, Optional, Dict, Any, AsyncIterator
+import os
+import time
+from collections import deque
+from typing import List, Optional, Dict, Any, AsyncIterator, Awaitable, Callable
 from dataclasses import dataclass
 from datetime import datetime
 
-from telethon import TelegramClient
+from telethon import TelegramClient, events
+from telethon.errors import FloodWaitError
 from telethon.sessions import StringSession
+from telethon.utils import get_peer_id
 
 logger = logging.getLogger(__name__)
 
+# Max new messages fetched per channel per request
+MAX_MESSAGES_PER_POLL = 50
 
-@dataclass
+# Max messages fetched per channel in one poll when catching up (several requests)
+MAX_CATCHUP_MESSAGES = 250
+
+# Saved offsets older than this are ignored (stale alerts are worse than a gap)
+OFFSETS_MAX_AGE = 600
+
+# Offsets are written at most once per this many seconds
+OFFSETS_FLUSH_DELAY = 5
+
+# Max concurrent sends to target channel (FloodWait back-off happens outside this limit)
+SEND_CONCURRENCY = 3
+
+
+@dataclass(slots=True)
 class IncomingMessage:
     """Wrapper for incoming Telegram message."""
     id: int
@@ -34,6 +55,7 @@ class TelegramIngestClient:
     - Connection management with auto-reconnect
     - Message ID tracking for deduplication
     - Batch polling from multiple channels
+    - Push updates (NewMessage events) as an alternative to polling
     """
     
     def __init__(
@@ -43,7 +65,8 @@ class TelegramIngestClient:
         session_string: str,
         source_channels: List[str],
         target_channel: str,
-        poll_interval: int = 30
+        poll_interval: int = 30,
+        offsets_file: Optional[str] = None
     ):
         self.api_id = api_id
         self.api_hash = api_hash
@@ -54,7 +77,78 @@ class TelegramIngestClient:
         
         self._client: Optional[TelegramClient] = None
         self._last_message_ids: Dict[str, int] = {}
+        # Recent IDs delivered by push updates, so a catch-up poll running
+        # at the same time does not yield them again
+        self._pushed_ids: dict[str, deque] = {}
+        self._entities: Dict[str, Any] = {}  # Resolved channel entities
+        self._target_entity: Any = None  # Resolved in validate_channels
         self._connected = False
+        self._send_semaphore = asyncio.Semaphore(SEND_CONCURRENCY)
+        
+        # Last message IDs survive restarts when an offsets file is configured
+        self.offsets_file = offsets_file
+        self._offsets_flush: Optional[asyncio.Task] = None
+        if offsets_file:
+            self._load_offsets()
+    
+    def _load_offsets(self):
+        """Load last message IDs saved by a previous run."""
+        try:
+            if not os.path.exists(self.offsets_file):
+                return
+            with open(self.offsets_file, encoding='utf-8') as f:
+                data = json.load(f)
+            # saved_at is stamped on every write, including the one on shutdown
+            saved_at = data.get('saved_at')
+            if saved_at is None:  # old format: plain {channel: id}
+                saved_at = os.path.getmtime(self.offsets_file)
+            else:
+                data = data.get('offsets', {})
+            age = time.time() - saved_at
+            if age > OFFSETS_MAX_AGE:
+                logger.info(f"Ignoring stale offsets file ({int(age)}s old)")
+                return
+            for channel in self.source_channels:
+                if isinstance(data.get(channel), int):
+                    self._last_message_ids[channel] = data[channel]
+            logger.info(f"Offsets loaded: {len(self._last_message_ids)} channels")
+        except Exception as e:
+            logger.warning(f"Failed to load offsets: {e}")
+    
+    def _save_offsets(self, snapshot: Dict[str, int]):
+        """Write last message IDs atomically (tmp file + rename)."""
+        tmp_path = f"{self.offsets_file}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'saved_at': time.time(), 'offsets': snapshot}, f)
+            os.replace(tmp_path, self.offsets_file)
+        except Exception as e:
+            logger.warning(f"Failed to save offsets: {e}")
+    
+    def _persist_offsets(self):
+        """Schedule a debounced offsets save (bursts of updates cause one write)."""
+        if self.offsets_file and self._offsets_flush is None:
+            self._offsets_flush = asyncio.create_task(self._flush_offsets_later())
+    
+    async def _flush_offsets_later(self):
+        await asyncio.sleep(OFFSETS_FLUSH_DELAY)
+        self._offsets_flush = None
+        # Worker thread keeps event loop responsive
+        await asyncio.to_thread(self._save_offsets, dict(self._last_message_ids))
+    
+    async def flush_offsets(self):
+        """
+        Write offsets now (called on shutdown).
+        
+        Writes even without pending changes, so saved_at marks when the process
+        stopped rather than when the last message arrived.
+        """
+        if self._offsets_flush is not None:
+            self._offsets_flush.cancel()
+            self._offsets_flush = None
+        if not self.offsets_file or not self._last_message_ids:
+            return
+        await asyncio.to_thread(self._save_offsets, dict(self._last_message_ids))
     
     async def connect(self) -> bool:
         """Connect to Telegram and verify authorization."""
@@ -83,6 +177,7 @@ class TelegramIngestClient:
     
     async def disconnect(self):
         """Disconnect from Telegram."""
+        await self.flush_offsets()
         if self._client:
             await self._client.disconnect()
             self._connected = False
@@ -121,6 +216,7 @@ class TelegramIngestClient:
         # Validate target
         try:
             target = await self._client.get_entity(self.target_channel)
+            self._target_entity = target
             logger.info(f"Target channel: {target.title} (@{self.target_channel})")
         except Exception as e:
             raise RuntimeError(f"Target channel not found: {e}")
@@ -130,6 +226,7 @@ class TelegramIngestClient:
         for channel in self.source_channels:
             try:
                 entity = await self._client.get_entity(channel)
+                self._entities[channel] = entity
                 valid_sources.append(channel)
                 logger.info(f"Source channel: {entity.title} (@{channel})")
             except Exception as e:
@@ -140,44 +237,156 @@ class TelegramIngestClient:
         
         return valid_sources, target
     
+    async def _get_entity(self, channel: str):
+        """Resolve channel entity once and reuse it across polls."""
+        entity = self._entities.get(channel)
+        if entity is None:
+            entity = await self._client.get_entity(channel)
+            self._entities[channel] = entity
+        return entity
+    
+    async def _seed_channel(self, channel: str, entity) -> None:
+        """Record the latest message ID so only newer messages are processed."""
+        latest = await self._client.get_messages(entity, limit=1)
+        if latest:
+            self._last_message_ids[channel] = latest[0].id
+            logger.info(f"Initial ID for @{channel}: {latest[0].id}")
+    
+    async def seed_last_message_ids(self) -> None:
+        """
+        Seed last message IDs for all resolved source channels.
+        
+        Called once at startup so the first poll already fetches new messages.
+        Channels that fail here are seeded on their first poll instead.
+        """
+        for channel, entity in self._entities.items():
+            if channel in self._last_message_ids:
+                continue
+            try:
+                await self._seed_channel(channel, entity)
+            except Exception as e:
+                logger.warning(f"Failed to seed @{channel}: {e}")
+    
+    async def _fetch_channel(self, channel: str) -> list:
+        """Fetch messages newer than the last seen ID for one channel (newest first)."""
+        try:
+            entity = await self._get_entity(channel)
+            last_id = self._last_message_ids.get(channel)
+            
+            # Not seeded at startup - save latest ID and skip
+            if last_id is None:
+                await self._seed_channel(channel, entity)
+                return []
+            
+            # Server returns only messages newer than last_id
+            messages = list(await self._client.get_messages(
+                entity, min_id=last_id, limit=MAX_MESSAGES_PER_POLL
+            ))
+            # A full page means older unseen messages remain (e.g. after a disconnect)
+            page_size = len(messages)
+            while page_size == MAX_MESSAGES_PER_POLL and len(messages) < MAX_CATCHUP_MESSAGES:
+                page = await self._client.get_messages(
+                    entity, min_id=last_id, max_id=messages[-1].id, limit=MAX_MESSAGES_PER_POLL
+                )
+                page_size = len(page)
+                messages.extend(page)
+            if page_size == MAX_MESSAGES_PER_POLL and messages[-1].id > last_id + 1:
+                # Older unseen messages are not fetched; the offset still moves past them
+                logger.warning(
+                    f"Catch-up limit reached for @{channel}: skipped IDs "
+                    f"{last_id + 1}-{messages[-1].id - 1}"
+                )
+            return messages
+        except Exception as e:
+            # Drop cached entity so it is re-resolved on next poll
+            self._entities.pop(channel, None)
+            logger.error(f"Error polling @{channel}: {e}")
+            return []
+    
     async def poll_new_messages(self) -> AsyncIterator[IncomingMessage]:
         """
         Poll all source channels for new messages.
         
+        Channels are fetched concurrently, then yielded channel by channel.
+        
         Yields:
             IncomingMessage for each new message
         """
         if not await self.ensure_connected():
             return
         
-        for channel in self.source_channels:
-            try:
-                entity = await self._client.get_entity(channel)
+        results = await asyncio.gather(
+            *(self._fetch_channel(channel) for channel in self.source_channels)
+        )
+        
+        before = dict(self._last_message_ids)
+        for channel, new_messages in zip(self.source_channels, results, strict=True):
+            for message in reversed(new_messages):
+                # A push update may have handled it while this poll was fetching
+                if message.id in self._pushed_ids.get(channel, ()):
+                    continue
+                logger.info(f"New message in @{channel}: ID {message.id}")
                 
-                async for message in self._client.iter_messages(entity, limit=1):
-                    # First run - save ID and skip
-                    if channel not in self._last_message_ids:
-                        self._last_message_ids[channel] = message.id
-                        logger.info(f"Initial ID for @{channel}: {message.id}")
-                        continue
-                    
-                    # Check for new message
-                    if message.id > self._last_message_ids[channel]:
-                        logger.info(f"New message in @{channel}: ID {message.id}")
-                        
-                        yield IncomingMessage(
-                            id=message.id,
-                            text=message.text or "",
-                            channel=channel,
-                            timestamp=message.date,
-                            has_media=bool(message.media),
-                            raw_message=message
-                        )
-                        
-                        self._last_message_ids[channel] = message.id
-                        
-            except Exception as e:
-                logger.error(f"Error polling @{channel}: {e}")
+                yield self._to_incoming(message, channel)
+                
+                # Only move forward: pushes during the poll may be ahead of it
+                if message.id > self._last_message_ids.get(channel, 0):
+                    self._last_message_ids[channel] = message.id
+        
+        if self._last_message_ids != before:
+            self._persist_offsets()
+    
+    def add_message_handler(self, callback: Callable[[IncomingMessage], Awaitable[None]]) -> None:
+        """
+        Register push-update handler for new messages in source channels.
+        
+        Requires validate_channels() to have resolved the channel entities.
+        
+        Args:
+            callback: Coroutine function called with each IncomingMessage
+        """
+        if not self._entities:
+            raise RuntimeError("No resolved source channels")
+        
+        channels_by_peer = {
+            get_peer_id(entity): channel for channel, entity in self._entities.items()
+        }
+        
+        async def _on_new_message(event):
+            channel = channels_by_peer.get(event.chat_id)
+            if channel is None:
+                return
+            message = event.message
+            if message.id <= self._last_message_ids.get(channel, 0):
+                return  # already yielded by a catch-up poll
+            logger.info(f"New message in @{channel}: ID {message.id}")
+            pushed = self._pushed_ids.get(channel)
+            if pushed is None:
+                pushed = self._pushed_ids[channel] = deque(maxlen=MAX_CATCHUP_MESSAGES)
+            pushed.append(message.id)
+            self._last_message_ids[channel] = message.id
+            self._persist_offsets()
+            await callback(self._to_incoming(message, channel))
+        
+        self._client.add_event_handler(
+            _on_new_message,
+            events.NewMessage(chats=list(self._entities.values()))
+        )
+    
+    async def run_until_disconnected(self):
+        """Block while Telethon receives updates."""
+        await self._client.run_until_disconnected()
+    
+    @staticmethod
+    def _to_incoming(message, channel: str) -> IncomingMessage:
+        return IncomingMessage(
+            id=message.id,
+            text=message.text or "",
+            channel=channel,
+            timestamp=message.date,
+            has_media=bool(message.media),
+            raw_message=message
+        )
     
     async def send_message(self, text: str, media=None) -> bool:
         """
@@ -193,23 +402,38 @@ class TelegramIngestClient:
         if not await self.ensure_connected():
             return False
         
-        try:
-            if media:
-                await self._client.send_message(
-                    self.target_channel,
-                    text,
-                    file=media
-                )
-            else:
-                await self._client.send_message(
-                    self.target_channel,
-                    text
-                )
-            return True
+        # Resolved entity avoids a username lookup per send
+        target = self._target_entity or self.target_channel
+        
+        for attempt in range(2):
+            try:
+                async with self._send_semaphore:
+                    if media:
+                        await self._client.send_message(
+                            target,
+                            text,
+                            file=media
+                        )
+                    else:
+                        await self._client.send_message(
+                            target,
+                            text
+                        )
+                return True
             
-        except Exception as e:
-            logger.error(f"Failed to send message: {e}")
-            return False
+            except FloodWaitError as e:
+                # Back off only when Telegram asks for it (other sends go on), then retry once
+                if attempt:
+                    logger.error(f"Failed to send message: {e}")
+                    return False
+                logger.warning(f"Flood wait {e.seconds}s before sending")
+                await asyncio.sleep(e.seconds)
+            
+            except Exception as e:
+                logger.error(f"Failed to send message: {e}")
+                return False
+        
+        return False
     
     @property
     def is_connected(self) -> bool:
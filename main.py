@@ -3,6 +3,7 @@ Main entry point for Telegram Forwarder.
 """
 import os
 import sys
+import signal
 import asyncio
 import logging
 
@@ -26,6 +27,20 @@ def _get_log_level() -> int:
     return logging._nameToLevel.get(level_str, logging.INFO)
 
 
+async def _run_until_sigterm(coro) -> None:
+    """
+    Await coro, cancelling it on SIGTERM (how Render stops the worker).
+    
+    Cancellation lets the dispatcher's cleanup run: offsets, geocode cache, session.
+    """
+    loop = asyncio.get_running_loop()
+    loop.add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    try:
+        await coro
+    finally:
+        loop.remove_signal_handler(signal.SIGTERM)
+
+
 def main():
     """Application entry point."""
     setup_logging(_get_log_level())
@@ -72,21 +87,30 @@ def main():
 
     poll_interval = _get_env_int('POLL_INTERVAL', 30)
     dedup_interval = _get_env_int('DEDUP_INTERVAL', 300)
+    ingest_mode = os.getenv('INGEST_MODE', 'poll').strip().lower()
+    if ingest_mode not in ('poll', 'events'):
+        logger.error("INGEST_MODE must be 'poll' or 'events'")
+        sys.exit(1)
+    # Offsets advance when a message is queued for processing: messages still
+    # queued when the process stops are not fetched again after a restart
+    offsets_file = os.getenv('OFFSETS_FILE', 'offsets.json').strip() or None
     
     async def _run():
-        await create_and_run_dispatcher(
+        await _run_until_sigterm(create_and_run_dispatcher(
             api_id=api_id,
             api_hash=api_hash,
             session=session,
             sources=sources,
             target=target,
             poll_interval=poll_interval,
-            dedup_ttl=dedup_interval
-        )
+            dedup_ttl=dedup_interval,
+            mode=ingest_mode,
+            offsets_file=offsets_file
+        ))
     
     try:
         asyncio.run(_run())
-    except KeyboardInterrupt:
+    except (KeyboardInterrupt, asyncio.CancelledError):
         logger.info("Shutdown requested")
     except Exception as e:
         logger.error(f"Fatal error: {e}")
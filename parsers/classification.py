@@ -1,9 +1,16 @@
 """
 Threat classification helpers.
 """
+import re
+
 from core.constants import ThreatType, CITIES
 from parsers.patterns import PATTERNS
 
+# Keyword alternations, matched against lowercased text
+_ROCKET_KEYWORDS_RE = re.compile(r'ракет|калібр|крилат')
+_RECON_KEYWORDS_RE = re.compile(r'розвідк|розвідувальн|бпла-розвідник')
+_BPLA_KEYWORDS_RE = re.compile(r'бпла|шахед|герань|мопед|балалайк')
+
 
 def classify_threat(text: str) -> ThreatType:
     """
@@ -21,23 +28,20 @@ def classify_threat(text: str) -> ThreatType:
     
     text_lower = text.lower()
     
-    if PATTERNS.rocket['zagroza_ballistyka'].search(text):
+    # Everything below matches text_lower: no per-character case folding in the regex engine
+    if PATTERNS.gate['ballistic'].search(text_lower):
         return ThreatType.BALLISTIC
-    if PATTERNS.rocket['ballistika_na'].search(text):
-        return ThreatType.BALLISTIC
-    if any(x in text_lower for x in ['ракет', 'калібр', 'крилат']):
+    if _ROCKET_KEYWORDS_RE.search(text_lower):
         return ThreatType.ROCKET
-    if PATTERNS.rocket['vysokoshvydkisni'].search(text):
+    if PATTERNS.gate['high_speed'].search(text_lower):
         return ThreatType.ROCKET
-    if any(x in text_lower for x in ['каб', 'кабів']):
-        return ThreatType.KAB
-    if 'загроза застосування кабів' in text_lower:
+    if 'каб' in text_lower:
         return ThreatType.KAB
     if '💥' in text or 'вибух' in text_lower:
         return ThreatType.EXPLOSION
-    if any(x in text_lower for x in ['розвідк', 'розвідувальн', 'розвідувальний бпла', 'бпла-розвідник']):
+    if _RECON_KEYWORDS_RE.search(text_lower):
         return ThreatType.RECON
-    if any(x in text_lower for x in ['бпла', 'шахед', 'герань', 'мопед', 'балалайк']):
+    if _BPLA_KEYWORDS_RE.search(text_lower):
         return ThreatType.BPLA
 
     return ThreatType.UNKNOWN
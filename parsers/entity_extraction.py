@@ -3,27 +3,41 @@ Entity extraction - extract cities, regions, counts from text.
 Uses centralized patterns and priority-based matching.
 """
 import re
+from functools import lru_cache
 from typing import List, Optional
 from dataclasses import dataclass
 import logging
 
 from .patterns import PATTERNS
 from .normalize import normalize_city, normalize_region, extract_region_from_alias, is_skip_word
-from core.constants import CITIES, REGION_ALIASES, CHANNEL_REGIONS
-from utils.geo import get_region_for_city
+from core.constants import CITIES, REGION_ALIASES_LOWER, CHANNEL_REGIONS
+from utils.geo import resolve_city, cache_generation
+from utils.text import strip_parens, WHITESPACE_CHARS
 
-REGION_ALIASES_LOWER = {k.lower() for k in REGION_ALIASES}
-SUMMARY_COUNT_RE = re.compile(r'^\s*[А-ЯІЇЄҐа-яіїєґ\s]+—\s*\d+х\s*$')
-SUMMARY_HEADER_RE = re.compile(r'^\s*По\s+БпЛА\b', re.IGNORECASE)
+# Regional summary lines: counts like "Сумщина — 1х" or a "По БпЛА" header, one match instead of two
+SUMMARY_LINE_RE = re.compile(r'\s*(?:[А-ЯІЇЄҐа-яіїєґ\s]+—\s*\d+х\s*$|(?i:По\s+БпЛА\b))')
 SPECIAL_ATTENTION_RE = re.compile(r'^Особлива\s+увага\s*:\s*(.*)$', re.IGNORECASE)
+COMMA_SPLIT_RE = re.compile(r',\s*')
+CITY_LIST_SPLIT_RE = re.compile(r'\s*(?:,|\s+та\s+|/)\s*')
+DASH_SPLIT_RE = re.compile(r'\s*[-–—]\s*')
+DIGIT_RE = re.compile(r'\d')
+# Air-raid alert or shelter instruction lines, one search instead of two
+ALERT_LINE_RE = re.compile(
+    f"{PATTERNS.skip['alerts'].pattern}|{PATTERNS.skip['shelter'].pattern}", re.IGNORECASE
+)
+# Leading decoration stripped with str.lstrip (a plain character set, no regex)
+HEADER_PREFIX_CHARS = '✈️🛵🛸⚠️❗️🔴📡' + WHITESPACE_CHARS
+CITY_PREFIX_CHARS = '💥🛸🛵⚠️❗️🔴🚀✈️👁️•▪️*' + WHITESPACE_CHARS
+REGION_HEADER_RE = re.compile(r'^(\S+(?:\s+область)?):?\s*$', re.IGNORECASE)
+INLINE_REGION_HEADER_RE = re.compile(r'^(\S+(?:\s+область)?):\s*(.+)$', re.IGNORECASE)
 MAX_ATTENTION_ITEMS = 80
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ExtractedEntity:
-    """Extracted location entity."""
+    """Extracted location entity (immutable, results are memoized)."""
     city: str
     region: str
     count: Optional[int] = None
@@ -42,7 +56,13 @@ def extract_entities(text: str, channel: str = None) -> List[ExtractedEntity]:
     """
     if not text:
         return []
-    
+    # Regions also come from the geocode cache: don't reuse results from before a cached city changed
+    return list(_extract_entities(text, channel, cache_generation()))
+
+
+@lru_cache(maxsize=512)
+def _extract_entities(text: str, channel: Optional[str], _generation: int) -> tuple:
+    """Memoized extraction - same text is parsed by several rules and re-posted across channels."""
     entities = []
     current_region = CHANNEL_REGIONS.get(channel) if channel else None
     
@@ -65,13 +85,11 @@ def extract_entities(text: str, channel: str = None) -> List[ExtractedEntity]:
             special_attention = False
             continue
         
-        if PATTERNS.skip['alerts'].search(line) or PATTERNS.skip['shelter'].search(line):
+        if ALERT_LINE_RE.search(line):
             continue
 
         # Skip regional summary counts like "Сумщина — 1х"
-        if SUMMARY_COUNT_RE.match(line):
-            continue
-        if SUMMARY_HEADER_RE.match(line):
+        if SUMMARY_LINE_RE.match(line):
             continue
 
         # Parse "Особлива увага" blocks with city list
@@ -106,20 +124,14 @@ def extract_entities(text: str, channel: str = None) -> List[ExtractedEntity]:
             current_region = header_match
             continue
 
-        entity = _extract_city_region_parens(line)
-        if entity:
-            entities.append(entity)
-            continue
-
-        entity = _extract_kursom_na_city_region(line)
-        if entity:
-            entities.append(entity)
-            continue
-
-        entity = _extract_city_region_alias_parens(line)
-        if entity:
-            entities.append(entity)
-            continue
+        # The three "(Region)" formats all need a parenthesis; most lines have none
+        if '(' in line:
+            entity = (_extract_city_region_parens(line)
+                      or _extract_kursom_na_city_region(line)
+                      or _extract_city_region_alias_parens(line))
+            if entity:
+                entities.append(entity)
+                continue
         
         region_cities = _extract_region_colon_cities(line, current_region)
         if region_cities:
@@ -132,12 +144,17 @@ def extract_entities(text: str, channel: str = None) -> List[ExtractedEntity]:
             entities.extend(oberezhno_entities)
             continue
         
-        context_entities = _extract_with_context(line, current_region)
+        # Remaining patterns need a region: header/channel context or alias in the line
+        line_region = current_region or extract_region_from_alias(line)
+        if not line_region:
+            continue
+        
+        context_entities = _extract_with_context(line, line_region)
         if context_entities:
             entities.extend(context_entities)
             continue
         
-        arrow_entities = _extract_arrow_city(line, current_region)
+        arrow_entities = _extract_arrow_city(line, line_region)
         if arrow_entities:
             entities.extend(arrow_entities)
     
@@ -151,35 +168,39 @@ def extract_entities(text: str, channel: str = None) -> List[ExtractedEntity]:
             'special_attention'
         ))
 
-    return [e for e in entities if _is_valid_entity(e)]
+    return tuple(e for e in entities if _is_valid_entity(e))
+
+
+def _resolve_header_region(region_name: str) -> Optional[str]:
+    region_name = region_name.strip().rstrip(':')
+    region = REGION_ALIASES_LOWER.get(region_name.lower())
+    if region:
+        return region
+    if 'област' in region_name.lower():
+        return normalize_region(region_name)
+    return None
 
 
 def _extract_region_header(line: str) -> Optional[str]:
-    clean = re.sub(r'^[✈️🛵🛸⚠️❗️🔴📡\s]+', '', line).strip()
-    match = re.match(r'^(\S+(?:\s+область)?):?\s*$', clean, re.IGNORECASE)
+    clean = line.lstrip(HEADER_PREFIX_CHARS).strip()
+    match = REGION_HEADER_RE.match(clean)
     if match:
-        region_name = match.group(1).strip().rstrip(':')
-        if region_name in REGION_ALIASES:
-            return REGION_ALIASES[region_name]
-        if 'област' in region_name.lower():
-            return normalize_region(region_name)
+        return _resolve_header_region(match.group(1))
     return None
 
 
 def _extract_inline_region_header(line: str) -> Optional[tuple]:
-    clean = re.sub(r'^[✈️🛵🛸⚠️❗️🔴📡\s]+', '', line).strip()
-    match = re.match(r'^(\S+(?:\s+область)?):\s*(.+)$', clean, re.IGNORECASE)
+    if ':' not in line:
+        return None
+    clean = line.lstrip(HEADER_PREFIX_CHARS).strip()
+    match = INLINE_REGION_HEADER_RE.match(clean)
     if not match:
         return None
 
-    region_name = match.group(1).strip().rstrip(':')
-    remainder = match.group(2).strip()
-    region = REGION_ALIASES.get(region_name)
-    if not region and 'област' in region_name.lower():
-        region = normalize_region(region_name)
+    region = _resolve_header_region(match.group(1))
     if not region:
         return None
-    return region, remainder
+    return region, match.group(2).strip()
 
 
 def _extract_city_region_parens(line: str) -> Optional[ExtractedEntity]:
@@ -194,7 +215,7 @@ def _extract_city_region_parens(line: str) -> Optional[ExtractedEntity]:
     if not city or is_skip_word(city):
         return None
     
-    if city in REGION_ALIASES:
+    if city.lower() in REGION_ALIASES_LOWER:
         return None
     
     city = normalize_city(city)
@@ -223,7 +244,7 @@ def _extract_kursom_na_city_region(line: str) -> Optional[ExtractedEntity]:
     if not city or is_skip_word(city):
         return None
 
-    if city in REGION_ALIASES:
+    if city.lower() in REGION_ALIASES_LOWER:
         return None
 
     city = normalize_city(city)
@@ -265,6 +286,8 @@ def _extract_city_region_alias_parens(line: str) -> Optional[ExtractedEntity]:
 
 
 def _extract_region_colon_cities(line: str, default_region: str = None) -> List[ExtractedEntity]:
+    if ':' not in line:
+        return []
     match = PATTERNS.location['region_colon_cities'].search(line)
     if not match:
         return []
@@ -272,7 +295,7 @@ def _extract_region_colon_cities(line: str, default_region: str = None) -> List[
     region_name = match.group(1).strip()
     cities_part = match.group(2).strip()
     
-    region = REGION_ALIASES.get(region_name)
+    region = REGION_ALIASES_LOWER.get(region_name.lower())
     if not region and 'област' in region_name.lower():
         region = normalize_region(region_name)
     if not region:
@@ -281,7 +304,7 @@ def _extract_region_colon_cities(line: str, default_region: str = None) -> List[
         return []
     
     entities = []
-    for entry in re.split(r',\s*', cities_part):
+    for entry in COMMA_SPLIT_RE.split(cities_part):
         city = _extract_city_from_entry(entry)
         if city and not is_skip_word(city):
             city = normalize_city(city)
@@ -309,7 +332,7 @@ def _extract_oberezhno_bpla(line: str) -> List[ExtractedEntity]:
     city = normalize_city(city)
     
     # Get region from geo (CITIES + cache)
-    region = get_region_for_city(city)
+    city, region = resolve_city(city)
     if not region:
         return []
     
@@ -321,219 +344,58 @@ def _extract_oberezhno_bpla(line: str) -> List[ExtractedEntity]:
     )]
 
 
-def _extract_with_context(line: str, current_region: str) -> List[ExtractedEntity]:
-    region = current_region or extract_region_from_alias(line)
+# Context patterns in priority order:
+# (pattern name, required keywords, needs digit, count group, cities group, default count, confidence)
+# A pattern is only searched when the line has a digit (if needed) and one of its keywords.
+_CONTEXT_RULES = (
+    ('from_city_to_city', ('від',), False, 1, 3, None, 0.85),
+    ('count_threat_na_city', None, True, 1, 2, None, 0.85),
+    ('count_na_city', None, True, 1, 2, None, 0.8),
+    ('count_city', None, True, 1, 2, None, 0.75),
+    ('kursom_na_city', ('курс',), False, None, 1, None, 0.75),
+    ('moves_to_city', None, False, None, 1, None, 0.75),
+    ('bpla_kursom_na', ('курс',), False, None, 1, None, 0.85),
+    # "✈️ City/р-н - обережно по БПЛА!"
+    ('oberezhno_bpla', ('обережно',), False, None, 1, None, 0.85),
+    ('n_v_rayoni', ('район',), True, 1, 2, None, 0.8),
+    ('threat_bilya_city', ('біля', 'поблизу'), False, None, 1, None, 0.8),
+    ('v_bik_city', ('бік',), False, None, 1, None, 0.75),
+    ('v_rayoni_city', ('район',), False, None, 1, None, 0.75),
+    ('threat_nad_city', ('над',), False, None, 1, None, 0.8),
+    ('po_shahedu_na', ('шахед',), False, None, 1, 1, 0.75),
+    ('city_to_you', ('шахед', 'бпла'), False, None, 1, None, 0.75),
+)
+# Same rules with the compiled pattern resolved once, not per line and rule
+_CONTEXT_RULE_PATTERNS = tuple((PATTERNS.location[rule[0]],) + rule for rule in _CONTEXT_RULES)
+
+
+def _extract_with_context(line: str, region: str) -> List[ExtractedEntity]:
     if not region:
         return []
 
-    entities: List[ExtractedEntity] = []
+    has_digit = DIGIT_RE.search(line) is not None
+    line_lower = line.lower()
     
-    match = PATTERNS.location['from_city_to_city'].search(line)
-    if match:
-        count = int(match.group(1)) if match.group(1) else None
-        cities_text = match.group(3)
-        if cities_text:
-            entities.extend(_build_entities_from_city_list(
-                cities_text,
-                region,
-                count,
-                0.85,
-                'from_city_to_city'
-            ))
-            return entities
-    
-    match = PATTERNS.location['count_threat_na_city'].search(line)
-    if match:
-        count = int(match.group(1))
-        cities_text = match.group(2)
-        if cities_text:
-            entities.extend(_build_entities_from_city_list(
-                cities_text,
-                region,
-                count,
-                0.85,
-                'count_threat_na_city'
-            ))
-            return entities
-
-    match = PATTERNS.location['count_na_city'].search(line)
-    if match:
-        count = int(match.group(1))
-        cities_text = match.group(2)
-        if cities_text:
-            entities.extend(_build_entities_from_city_list(
-                cities_text,
-                region,
-                count,
-                0.8,
-                'count_na_city'
-            ))
-            return entities
-
-    match = PATTERNS.location['count_city'].search(line)
-    if match:
-        count = int(match.group(1))
-        cities_text = match.group(2)
-        if cities_text:
-            entities.extend(_build_entities_from_city_list(
-                cities_text,
-                region,
-                count,
-                0.75,
-                'count_city'
-            ))
-            return entities
-
-    match = PATTERNS.location['kursom_na_city'].search(line)
-    if match:
-        cities_text = match.group(1)
-        if cities_text:
-            entities.extend(_build_entities_from_city_list(
-                cities_text,
-                region,
-                None,
-                0.75,
-                'kursom_na_city'
-            ))
-            return entities
-
-    match = PATTERNS.location['moves_to_city'].search(line)
-    if match:
-        cities_text = match.group(1)
-        if cities_text:
-            entities.extend(_build_entities_from_city_list(
-                cities_text,
-                region,
-                None,
-                0.75,
-                'moves_to_city'
-            ))
-            return entities
-    
-    match = PATTERNS.location['bpla_kursom_na'].search(line)
-    if match:
-        cities_text = match.group(1)
-        if cities_text:
-            entities.extend(_build_entities_from_city_list(
-                cities_text,
-                region,
-                None,
-                0.85,
-                'bpla_kursom_na'
-            ))
-            return entities
-    
-    # "✈️ City/р-н - обережно по БПЛА!"
-    match = PATTERNS.location['oberezhno_bpla'].search(line)
-    if match:
-        cities_text = match.group(1)
-        if cities_text:
-            entities.extend(_build_entities_from_city_list(
-                cities_text,
-                region,
-                None,
-                0.85,
-                'oberezhno_bpla'
-            ))
-            return entities
-    
-    match = PATTERNS.location['n_v_rayoni'].search(line)
-    if match:
-        count = int(match.group(1))
-        cities_text = match.group(2)
-        if cities_text:
-            entities.extend(_build_entities_from_city_list(
-                cities_text,
-                region,
-                count,
-                0.8,
-                'n_v_rayoni'
-            ))
-            return entities
-
-    match = PATTERNS.location['threat_bilya_city'].search(line)
-    if match:
-        cities_text = match.group(1)
-        if cities_text:
-            entities.extend(_build_entities_from_city_list(
-                cities_text,
-                region,
-                None,
-                0.8,
-                'threat_bilya_city'
-            ))
-            return entities
-
-    match = PATTERNS.location['v_bik_city'].search(line)
-    if match:
-        cities_text = match.group(1)
-        if cities_text:
-            entities.extend(_build_entities_from_city_list(
-                cities_text,
-                region,
-                None,
-                0.75,
-                'v_bik_city'
-            ))
-            return entities
-
-    match = PATTERNS.location['v_rayoni_city'].search(line)
-    if match:
-        cities_text = match.group(1)
-        if cities_text:
-            entities.extend(_build_entities_from_city_list(
-                cities_text,
-                region,
-                None,
-                0.75,
-                'v_rayoni_city'
-            ))
-            return entities
-
-    match = PATTERNS.location['threat_nad_city'].search(line)
-    if match:
-        cities_text = match.group(1)
-        if cities_text:
-            entities.extend(_build_entities_from_city_list(
-                cities_text,
-                region,
-                None,
-                0.8,
-                'threat_nad_city'
-            ))
-            return entities
-
-    match = PATTERNS.location['po_shahedu_na'].search(line)
-    if match:
-        cities_text = match.group(1)
-        if cities_text:
-            entities.extend(_build_entities_from_city_list(
-                cities_text,
-                region,
-                1,
-                0.75,
-                'po_shahedu_na'
-            ))
-            return entities
-
-    match = PATTERNS.location['city_to_you'].search(line)
-    if match:
-        cities_text = match.group(1)
-        if cities_text:
-            entities.extend(_build_entities_from_city_list(
-                cities_text,
-                region,
-                None,
-                0.75,
-                'city_to_you'
-            ))
-            return entities
+    for rule in _CONTEXT_RULE_PATTERNS:
+        pattern, name, keywords, needs_digit, count_group, cities_group, default_count, confidence = rule
+        if needs_digit and not has_digit:
+            continue
+        if keywords and not any(k in line_lower for k in keywords):
+            continue
+        match = pattern.search(line)
+        if not match:
+            continue
+        cities_text = match.group(cities_group)
+        if not cities_text:
+            continue
+        count_text = match.group(count_group) if count_group else None
+        count = int(count_text) if count_text else default_count
+        return _build_entities_from_city_list(cities_text, region, count, confidence, name)
 
-    return entities
+    return []
 
 
-def _extract_arrow_city(line: str, current_region: str) -> List[ExtractedEntity]:
-    region = current_region or extract_region_from_alias(line)
+def _extract_arrow_city(line: str, region: str) -> List[ExtractedEntity]:
     if not region:
         return []
     
@@ -547,7 +409,7 @@ def _extract_arrow_city(line: str, current_region: str) -> List[ExtractedEntity]
     else:
         content = match.group(1).strip()
     
-    if content in REGION_ALIASES:
+    if content.lower() in REGION_ALIASES_LOWER:
         return []
     
     cities = _split_cities(content)
@@ -566,71 +428,97 @@ def _extract_arrow_city(line: str, current_region: str) -> List[ExtractedEntity]
     return entities
 
 
-def _extract_city_from_entry(entry: str) -> Optional[str]:
-    entry = entry.strip()
-    
-    match = re.match(r'^\d+\s+(?:на|в районі|біля|повз)\s+(.+?)$', entry, re.IGNORECASE)
-    if match:
-        return match.group(1).strip().rstrip('.,;')
-    
-    match = re.match(r'^\d+\s+([А-ЯІЇЄҐа-яіїєґ\'\-\s]+)$', entry, re.IGNORECASE)
-    if match:
-        return match.group(1).strip().rstrip('.,;')
-    
-    match = re.match(r'^\d+\s*х?\s*шахед[іиів]*\s+на\s+(.+?)$', entry, re.IGNORECASE)
-    if match:
-        return match.group(1).strip().rstrip('.,;')
-    
-    match = re.match(r'^(?:БпЛА|БПЛА)\s+курсом\s+на\s+(.+?)$', entry, re.IGNORECASE)
-    if match:
-        return match.group(1).strip().rstrip('.,;')
+# "N на City", "N City", "Nх шахедів на City", "БпЛА курсом на City", ...
+# Alternatives are tried in order, as the former sequence of re.match calls was;
+# used with fullmatch, so the trailing city group needs no lazy quantifier or $ anchor
+CITY_ENTRY_RE = re.compile(
+    r'\d+\s+(?:на|в районі|біля|повз)\s+(.+)'
+    r'|\d+\s+([А-ЯІЇЄҐа-яіїєґ\'\-\s]+)'
+    r'|\d+\s*х?\s*шахед[іиів]*\s+на\s+(.+)'
+    r'|(?:БпЛА|БПЛА)\s+курсом\s+на\s+(.+)'
+    r'|\d+\s+(?:біля|поблизу)\s+(.+)'
+    r'|(?:кружляє|крутиться)\s+біля\s+(.+)'
+    r'|(?:шахед|БпЛА|БПЛА)\s+над\s+(.+)',
+    re.IGNORECASE
+)
 
-    match = re.match(r'^\d+\s+(?:біля|поблизу)\s+(.+?)$', entry, re.IGNORECASE)
-    if match:
-        return match.group(1).strip().rstrip('.,;')
-
-    match = re.match(r'^(?:кружляє|крутиться)\s+біля\s+(.+?)$', entry, re.IGNORECASE)
-    if match:
-        return match.group(1).strip().rstrip('.,;')
 
-    match = re.match(r'^(?:шахед|БпЛА|БПЛА)\s+над\s+(.+?)$', entry, re.IGNORECASE)
+def _extract_city_from_entry(entry: str) -> Optional[str]:
+    match = CITY_ENTRY_RE.fullmatch(entry.strip())
     if match:
-        return match.group(1).strip().rstrip('.,;')
-    
+        return match.group(match.lastindex).strip().rstrip('.,;')
     return None
 
 
+# Prepositions and truncated prefixes that are never city names
+_CITY_STOP_WORDS = frozenset({
+    'на', 'над', 'під', 'до', 'від', 'через', 'біля', 'коло', 'рух', 'курс', 'курсом', 'шт', 'кам', 'сам',
+    'дні', 'хар', 'пол', 'оде', 'мик', 'берегом', 'берег', 'море', 'морем',
+})
+_CITY_GARBAGE_WORDS = frozenset({
+    'небо', 'столба', 'столб', 'застава', 'заставу', 'сторону', 'напрямок', 'напрямку',
+    'північ', 'південь', 'схід', 'захід', 'центр', 'район', 'села', 'міста', 'області',
+    'ракета', 'ракети', 'ракету', 'дрон', 'дрона', 'дрони', 'бпла', 'шахед', 'каб',
+    'летит', 'летить', 'літає', 'коси', 'косу', 'косі', 'коса',
+})
+
+
+# _clean_city_name cleanup, in the order applied
+# Emoji (and their U+FE0F variation selectors) deleted in one str.translate pass
+_CITY_EMOJI_TABLE = str.maketrans('', '', '💥🛸🛵⚠️❗️🔴🚀✈️👁️')
+# Leading junk: count, threat word, motion word, "між", heading phrase, flying phrase.
+# Each part is optional and tried in that order, so one match strips them all.
+_CITY_LEADING_RE = re.compile(
+    r'^(?-i:\d+\s*х?\s*)?'
+    r'(?:(?:БПЛА|БпЛА|БПЛA|шахед[іиів]*)\s*)?'
+    r'(?:(?:останній|крутиться|кружляє|кружляють|маневрує|маневрують|крутяться)\s+)?'
+    r'(?:(?:між|поміж)\s+)?'
+    r'(?:(?:продовжує\s+рух\s+на|у\s+напрямку|в\s+напрямку|на|рух\s+на)\s+)?'
+    r'(?:(?:летят\s+в\s+сторону|летить\s+на|пока|поки)\s+)?',
+    re.IGNORECASE
+)
+_CITY_BLACK_SEA_RE = re.compile(r'\s*[ву]\s+чорному\s+мор[іюя].*$', re.IGNORECASE)
+_CITY_CIRCLING_RE = re.compile(r'\s+крутяться\s*$', re.IGNORECASE)
+_CITY_FROM_SHCHYNA_RE = re.compile(r'\s+з\s+\S+щин[иіу]?\s*$', re.IGNORECASE)
+_CITY_FROM_CHCHYNA_RE = re.compile(r'\s+з\s+\S+ччин[иіу]?\s*$', re.IGNORECASE)
+_CITY_FROM_BLACK_SEA_RE = re.compile(r'\s+з\s+чорного\s+моря\s*$', re.IGNORECASE)
+_CITY_FROM_SEA_RE = re.compile(r'\s+з\s+моря\s*$', re.IGNORECASE)
+_CITY_TOWARDS_RE = re.compile(r'\s+[ву]\s+бік\s+.+$', re.IGNORECASE)
+_CITY_COURSE_RE = re.compile(r'\s+курсом\s+на\s+.+$', re.IGNORECASE)
+_CITY_RAYON_RE = re.compile(r'р-н\s*$', re.IGNORECASE)
+_CITY_GLUED_RE = re.compile(r'(ів|ка|ки|не|ин|ів)(?:села|міста|району|області)\s*$', re.IGNORECASE)
+_CITY_CAMEL_RE = re.compile(r'^([А-ЯІЇЄҐ][а-яіїєґ\']+)([А-ЯІЇЄҐ][а-яіїєґ\']+)$')
+
+
+@lru_cache(maxsize=4096)
 def _clean_city_name(city: str) -> str:
     if not city:
         return ""
     
     city = city.strip()
-    city = re.sub(r'^[💥🛸🛵⚠️❗️🔴🚀✈️👁️•▪️\*\s]+', '', city)
-    city = re.sub(r'\([^)]*\)?', '', city).strip()  # Remove incomplete parens too
-    city = re.sub(r'[💥🛸🛵⚠️❗️🔴🚀✈️👁️]+', '', city)
-    city = re.sub(r'^\d+\s*х?\s*', '', city)
-    city = re.sub(r'^(?:БПЛА|БпЛА|БПЛA|шахед[іиів]*)\s*', '', city, flags=re.IGNORECASE)
-    city = re.sub(r'^(?:останній|крутиться|кружляє|кружляють|маневрує|маневрують|крутяться)\s+', '', city, flags=re.IGNORECASE)
-    city = re.sub(r'^(?:між|поміж)\s+', '', city, flags=re.IGNORECASE)
-    # Clean movement phrases
-    city = re.sub(r'^(?:продовжує\s+рух\s+на|у\s+напрямку|в\s+напрямку|на|рух\s+на)\s+', '', city, flags=re.IGNORECASE)
-    city = re.sub(r'^(?:летят\s+в\s+сторону|летить\s+на|пока|поки)\s+', '', city, flags=re.IGNORECASE)
+    city = city.lstrip(CITY_PREFIX_CHARS)
+    city = strip_parens(city).strip()  # Remove incomplete parens too
+    city = city.translate(_CITY_EMOJI_TABLE)
+    # Leading counts, threat words and movement phrases
+    city = _CITY_LEADING_RE.sub('', city, count=1)
     # Remove "в/у Чорному морі" phrases
-    city = re.sub(r'\s*[ву]\s+чорному\s+мор[іюя].*$', '', city, flags=re.IGNORECASE)
+    city = _CITY_BLACK_SEA_RE.sub('', city)
     # Remove trailing movement words
-    city = re.sub(r'\s+крутяться\s*$', '', city, flags=re.IGNORECASE)
-    city = re.sub(r'\s+з\s+\S+щин[иіу]?\s*$', '', city, flags=re.IGNORECASE)
-    city = re.sub(r'\s+з\s+\S+ччин[иіу]?\s*$', '', city, flags=re.IGNORECASE)
-    city = re.sub(r'\s+з\s+чорного\s+моря\s*$', '', city, flags=re.IGNORECASE)
-    city = re.sub(r'\s+з\s+моря\s*$', '', city, flags=re.IGNORECASE)
-    city = re.sub(r'\s+[ву]\s+бік\s+.+$', '', city, flags=re.IGNORECASE)
-    city = re.sub(r'\s+курсом\s+на\s+.+$', '', city, flags=re.IGNORECASE)
+    city = _CITY_CIRCLING_RE.sub('', city)
+    # Remove trailing origin "з Херсонщини" / "з моря"
+    if 'з' in city or 'З' in city:
+        city = _CITY_FROM_SHCHYNA_RE.sub('', city)
+        city = _CITY_FROM_CHCHYNA_RE.sub('', city)
+        city = _CITY_FROM_BLACK_SEA_RE.sub('', city)
+        city = _CITY_FROM_SEA_RE.sub('', city)
+    city = _CITY_TOWARDS_RE.sub('', city)
+    city = _CITY_COURSE_RE.sub('', city)
     # Remove district suffix "р-н" attached to city name
-    city = re.sub(r'р-н\s*$', '', city, flags=re.IGNORECASE)
+    city = _CITY_RAYON_RE.sub('', city)
     # Split glued words like "Очаківсела" -> "Очаків"
-    city = re.sub(r'(ів|ка|ки|не|ин|ів)(?:села|міста|району|області)\s*$', r'\1', city, flags=re.IGNORECASE)
+    city = _CITY_GLUED_RE.sub(r'\1', city)
     # Split CamelCase glued words like "ГалициновеМиколаї" -> take first word "Галицинове"
-    camel_match = re.match(r'^([А-ЯІЇЄҐ][а-яіїєґ\']+)([А-ЯІЇЄҐ][а-яіїєґ\']+)$', city)
+    camel_match = _CITY_CAMEL_RE.match(city)
     if camel_match:
         city = camel_match.group(1)  # Take first word only
     if ' та ' in city:
@@ -643,14 +531,10 @@ def _clean_city_name(city: str) -> str:
         return ""
     # Skip common non-city words and truncated prefixes
     # Note: removed 'зап' - conflicts with Запоріжжя
-    if city_lower in ('на', 'над', 'під', 'до', 'від', 'через', 'біля', 'коло', 'рух', 'курс', 'курсом', 'шт', 'кам', 'сам', 'дні', 'хар', 'пол', 'оде', 'мик', 'берегом', 'берег', 'море', 'морем'):
+    if city_lower in _CITY_STOP_WORDS:
         return ""
     # Skip common nouns that are not cities
-    garbage_words = {'небо', 'столба', 'столб', 'застава', 'заставу', 'сторону', 'напрямок', 'напрямку', 
-                     'північ', 'південь', 'схід', 'захід', 'центр', 'район', 'села', 'міста', 'області',
-                     'ракета', 'ракети', 'ракету', 'дрон', 'дрона', 'дрони', 'бпла', 'шахед', 'каб',
-                     'летит', 'летить', 'літає', 'коси', 'косу', 'косі', 'коса'}
-    if city_lower in garbage_words:
+    if city_lower in _CITY_GARBAGE_WORDS:
         return ""
     if 'невизначеного' in city_lower and 'тип' in city_lower:
         return ""
@@ -691,7 +575,7 @@ def _clean_city_name(city: str) -> str:
 
 
 def _split_cities(content: str) -> List[str]:
-    parts = re.split(r'\s*(?:,|\s+та\s+|/)\s*', content)
+    parts = CITY_LIST_SPLIT_RE.split(content)
     filtered = []
     for part in parts:
         if not part:
@@ -699,7 +583,7 @@ def _split_cities(content: str) -> List[str]:
         low = part.lower()
         if low in ['р-н', 'р-ну', 'р-на', 'район', 'околиці']:
             continue
-        if part in REGION_ALIASES or low in REGION_ALIASES_LOWER:
+        if low in REGION_ALIASES_LOWER:
             continue
         filtered.append(part)
     return filtered
@@ -715,7 +599,7 @@ def _build_entities_from_city_list(
     entities: List[ExtractedEntity] = []
     for city in _split_cities(cities_text):
         if any(dash in city for dash in ['-', '–', '—']):
-            parts = re.split(r'\s*[-–—]\s*', city, maxsplit=1)
+            parts = DASH_SPLIT_RE.split(city, maxsplit=1)
             if len(parts) == 2:
                 left, right = [c.strip() for c in parts]
                 left_norm = normalize_city(left, use_ai=False) or left
@@ -737,9 +621,12 @@ def _build_entities_from_city_list(
         if not city or is_skip_word(city):
             continue
         normalized_city = normalize_city(city)
-        resolved_region = region or get_region_for_city(normalized_city, region)
+        city_name, resolved_region = resolve_city(normalized_city, region)
+        if region and resolved_region != region:
+            # Header region wins over a same-named city elsewhere
+            city_name, resolved_region = normalized_city, region
         entities.append(ExtractedEntity(
-            city=normalized_city,
+            city=city_name,
             region=resolved_region,
             count=count,
             confidence=confidence,
@@ -757,7 +644,7 @@ def _is_valid_entity(entity: ExtractedEntity) -> bool:
         return False
     if is_skip_word(entity.city):
         return False
-    if entity.city in REGION_ALIASES:
+    if entity.city.lower() in REGION_ALIASES_LOWER:
         return False
     return True
 
@@ -1,4 +1,6 @@
 """Compatibility wrapper for renamed entity_extraction module."""
-from .entity_extraction import ExtractedEntity, extract_entities, get_region_for_city
+from utils.geo import get_region_for_city
 
-__all__ = ['ExtractedEntity', 'extract_entities', 'get_region_for_city']
+from .entity_extraction import ExtractedEntity, extract_entities, resolve_city
+
+__all__ = ['ExtractedEntity', 'extract_entities', 'get_region_for_city', 'resolve_city']
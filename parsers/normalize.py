@@ -6,47 +6,72 @@ Uses morphological rules for Ukrainian language, no dictionaries.
 import re
 from functools import lru_cache
 from typing import Optional
-from core.constants import REGION_ALIASES, SKIP_WORDS
+from core.constants import CITIES, REGION_ALIASES_LOWER, SKIP_WORDS
+from utils.text import WHITESPACE_CHARS
 
 
 # Precompiled patterns for normalization
 _MARKDOWN = re.compile(r'\*\*|__|~~')
-_URLS = re.compile(r'https?://[^\s]+')
+_URLS = re.compile(r'https?://\S+')
 _USERNAMES = re.compile(r'@\w+')
-_EMOJI_ONLY = re.compile(r'^[➡️⬅️↗️↘️↖️↙️⬆️⬇️🇺🇦\s|]+$')
+# Arrow/flag decoration characters; a line made only of these (and spaces) is dropped
+_EMOJI_ONLY_CHARS = '➡️⬅️↗️↘️↖️↙️⬆️⬇️🇺🇦|' + WHITESPACE_CHARS
 _SKIP_LINE = re.compile(
     r'Підписатися|ППОшник|Моніторинг 24/7|Радар України|Напрямок ракет|Карта повітряних тривог|Не фіксується|'
     r'Загроза для .*р-?в|передмісті\s+чисто|\bчисто\b'
 )
 _MULTI_SPACE = re.compile(r'\s+')
-_EMOJI_PREFIX = re.compile(r'^[💥🛸🛵⚠️❗️🔴🚀✈️👁️📡\*\s]+')
 _REGION_SUFFIX = re.compile(r'\s*\([^)]*(?:щина|ччина|область|обл\.?)[^)]*\)\s*$', re.IGNORECASE)
+# normalize_city cleanup
+_CITY_JUNK = re.compile(r'[^\w\s\'\-]')
+# "БпЛА"/"Район", then "на", then "Ст." - each optional, in that order
+_CITY_PREFIXES = re.compile(r'^(?:(?:Район|бпла|БпЛА|БПЛА|БПЛA)\s*)?(?:на\s+)?(?:Ст\.\s*)?', re.IGNORECASE)
+_RAYON_SUFFIX = re.compile(r'\s+р-н$', re.IGNORECASE)
+_R_SUFFIX = re.compile(r'\s+р$')
+_DOUBLE_OBL = re.compile(r'\s+обл\.?\s+обл\.?', re.IGNORECASE)
 
+# Region aliases in lookup order, plus one alternation to reject lines without any alias
+_REGION_ALIASES_LOWER = tuple(REGION_ALIASES_LOWER.items())
+_REGION_ALIAS_ANY = re.compile('|'.join(
+    re.escape(alias) for alias in sorted({a for a, _ in _REGION_ALIASES_LOWER}, key=len, reverse=True)
+))
 
+
+@lru_cache(maxsize=512)
 def normalize_text(text: str) -> str:
     """
     Clean raw message text for parsing.
+    
+    Memoized: the same alert is often reposted by several source channels.
     """
     if not text:
         return ""
     
     text = _MARKDOWN.sub('', text)
+    # URLs and mentions never span lines, so strip them in whole-text passes;
+    # skip checks still look at the original line
+    stripped = _URLS.sub('', text) if '://' in text else text
+    if '@' in stripped:
+        stripped = _USERNAMES.sub('', stripped)
+    
+    raw_lines = text.split('\n')
+    # Most messages have no URLs or mentions: reuse the same split
+    stripped_lines = raw_lines if stripped is text else stripped.split('\n')
     
     lines = []
-    for line in text.split('\n'):
-        line = line.strip()
+    for raw_line, line in zip(raw_lines, stripped_lines, strict=True):
+        raw_line = raw_line.strip()
         
-        if not line or line in ['ㅤ', '─' * len(line)]:
+        # Empty, filler-only or '────' separator lines
+        if not raw_line or raw_line == 'ㅤ' or not raw_line.strip('─'):
             continue
         
-        if _SKIP_LINE.search(line):
+        if _SKIP_LINE.search(raw_line):
             continue
         
-        if _EMOJI_ONLY.match(line):
+        if not raw_line.strip(_EMOJI_ONLY_CHARS):
             continue
         
-        line = _URLS.sub('', line)
-        line = _USERNAMES.sub('', line)
         line = _MULTI_SPACE.sub(' ', line).strip()
         
         if line:
@@ -70,21 +95,24 @@ def normalize_city(city: str, use_ai: bool = False) -> str:
     
     city = city.strip()
     
-    # Remove emoji and special chars
-    city = _EMOJI_PREFIX.sub('', city).strip()
-    city = re.sub(r'[^\w\s\'\-]', '', city, flags=re.UNICODE).strip()
+    # Known cities are already nominative
+    if city in CITIES:
+        return city
+    
+    # Remove emoji and special chars (covers any leading emoji prefix too)
+    city = _CITY_JUNK.sub('', city).strip()
     
     # Remove prefixes
-    city = re.sub(r'^(Район|бпла|БпЛА|БПЛА|БПЛA)\s*', '', city, flags=re.IGNORECASE).strip()
-    city = re.sub(r'^на\s+', '', city, flags=re.IGNORECASE).strip()
-    city = re.sub(r'^Ст\.\s*', '', city, flags=re.IGNORECASE).strip()
+    city = _CITY_PREFIXES.sub('', city, count=1).strip()
     
     # Remove region in parentheses
     city = _REGION_SUFFIX.sub('', city).strip()
     
     # Remove suffixes
-    city = re.sub(r'\s+р-н$', '', city, flags=re.IGNORECASE)
-    city = re.sub(r'\s+р$', '', city)
+    if city[-3:].lower() == 'р-н':
+        city = _RAYON_SUFFIX.sub('', city)
+    if city.endswith('р'):
+        city = _R_SUFFIX.sub('', city)
     
     # Remove trailing punctuation
     city = city.rstrip('.!?,;:')
@@ -150,11 +178,42 @@ def _normalize_adjective(word: str) -> str:
         if lower.endswith(('ову', 'ару', 'ику', 'алу')):
             return word[:-1] + 'а'
     
-    # Capitalize
-    if word and word[0].islower():
-        return word[0].upper() + word[1:]
-    
-    return word
+    return _capitalize(word)
+
+
+# -ки words that are nominative plural, not genitive singular
+_PLURAL_KI = frozenset({'прилуки', 'маяки', 'лубки', 'черки', 'суки'})
+
+# Cities with -ів/-їв as part of the nominative stem (not genitive plural)
+_NOMINATIVE_IV = frozenset({
+    'харків', 'київ', 'львів', 'чернігів', 'очаків', 'миколаїв',
+    'дніпрів', 'черкасів', 'покровів', 'васильків', 'борислів',
+    'калинів', 'любомирів', 'первомайськів', 'южноукраїнськів',
+    'богодухів', 'куп\'янськів', 'вознесенськів',
+})
+_NOMINATIVE_JIV = frozenset({'київ', 'миколаїв'})
+
+# Accusative ending (last two letters) -> replacement for the final letter
+_ACCUSATIVE_ENDINGS = {'ку': 'а', 'ну': 'а', 'лю': 'я', 'ію': 'я', 'цю': 'я'}
+
+_SPECIAL_CASES = {
+    # Genitive plural with zero ending -> nominative plural
+    'сум': 'Суми',
+    'черкас': 'Черкаси',
+    'лубен': 'Лубни',
+    'ромен': 'Ромни',
+    'прилук': 'Прилуки',
+    # Genitive with consonant cluster
+    'конотопа': 'Конотоп',
+    'лебедина': 'Лебедин',
+    'павлограда': 'Павлоград',
+    # Genitive from -а stem (plural)
+    'маяка': 'Маяки',
+    # Vowel alternation cases
+    'рогу': 'Ріг',
+    'рогa': 'Ріг',
+    'ріг': 'Ріг',
+}
 
 
 def _normalize_single_word(word: str) -> str:
@@ -181,34 +240,19 @@ def _normalize_single_word(word: str) -> str:
     # ============ SAFE: ACCUSATIVE -> NOMINATIVE ============
     # These endings are NEVER nominative for Ukrainian cities
     
-    # -ку -> -ка (Васильківку -> Васильківка)
-    if lower.endswith('ку'):
-        return _capitalize(word[:-1] + 'а')
+    # -ку/-ну/-лю/-ію/-цю -> -ка/-на/-ля/-ія/-ця (Васильківку -> Васильківка)
+    tail = lower[-2:]
+    ending = _ACCUSATIVE_ENDINGS.get(tail)
+    if ending and (tail != 'ну' or len(word) > 3):
+        return _capitalize(word[:-1] + ending)
     
     # -ки -> -ка (Софіївки -> Софіївка) - genitive singular
     # BUT NOT for plural cities: Прилуки, Маяки, Черкаси
-    plural_ki = {'прилуки', 'маяки', 'лубки', 'черки', 'суки'}
-    if lower.endswith('ки') and len(word) > 4 and lower not in plural_ki:
+    if tail == 'ки' and len(word) > 4 and lower not in _PLURAL_KI:
         # Also skip -уки, -аки patterns (likely plural)
         if not lower.endswith(('уки', 'аки', 'оки')):
             return _capitalize(word[:-1] + 'а')
     
-    # -ну -> -на (Просяну -> Просяна)
-    if lower.endswith('ну') and len(word) > 3:
-        return _capitalize(word[:-1] + 'а')
-    
-    # -лю -> -ля (Хотімлю -> Хотімля)
-    if lower.endswith('лю'):
-        return _capitalize(word[:-1] + 'я')
-    
-    # -ію -> -ія (Балаклію -> Балаклія)
-    if lower.endswith('ію'):
-        return _capitalize(word[:-1] + 'я')
-    
-    # -цю -> -ця
-    if lower.endswith('цю'):
-        return _capitalize(word[:-1] + 'я')
-    
     # ============ SAFE: GENITIVE -> NOMINATIVE ============
     
     # -ого -> -е (Синельникового -> Синельникове)
@@ -218,21 +262,14 @@ def _normalize_single_word(word: str) -> str:
     # -ів -> -и (Маяків -> Маяки, Циркунів -> Циркуни)
     # BUT NOT for cities ending in -ів as nominative (Харків, Київ, Львів, Чернігів, Очаків, Миколаїв)
     # These have -ів as part of the stem, not genitive plural ending
-    nominative_iv = {
-        'харків', 'київ', 'львів', 'чернігів', 'очаків', 'миколаїв',
-        'дніпрів', 'черкасів', 'покровів', 'васильків', 'борислів',
-        'калинів', 'любомирів', 'первомайськів', 'южноукраїнськів',
-        'богодухів', 'куп\'янськів', 'вознесенськів', 'первомайськів'
-    }
-    if lower.endswith('ів') and len(word) > 3 and lower not in nominative_iv:
+    if lower.endswith('ів') and len(word) > 3 and lower not in _NOMINATIVE_IV:
         # Only transform if it looks like genitive plural (5+ chars, stem >= 3)
         if len(word) >= 5:
             return _capitalize(word[:-2] + 'и')
     
     # -їв -> -ї (rare, mostly for foreign words)
     # NOT for Київ, Миколаїв - they are nominative
-    nominative_jiv = {'київ', 'миколаїв'}
-    if lower.endswith('їв') and len(word) > 4 and lower not in nominative_jiv:
+    if lower.endswith('їв') and len(word) > 4 and lower not in _NOMINATIVE_JIV:
         return _capitalize(word[:-2] + 'ї')
     
     # -ова -> -ів (Харкова -> Харків)
@@ -248,27 +285,9 @@ def _normalize_single_word(word: str) -> str:
     # ============ SPECIAL CASES (dictionary-like but minimal) ============
     # Only for cases where morphology alone can't determine the form
     
-    special_cases = {
-        # Genitive plural with zero ending -> nominative plural
-        'сум': 'Суми',
-        'черкас': 'Черкаси',
-        'лубен': 'Лубни',
-        'ромен': 'Ромни',
-        'прилук': 'Прилуки',
-        # Genitive with consonant cluster
-        'конотопа': 'Конотоп',
-        'лебедина': 'Лебедин',
-        'павлограда': 'Павлоград',
-        # Genitive from -а stem (plural)
-        'маяка': 'Маяки',
-        # Vowel alternation cases
-        'рогу': 'Ріг',
-        'рогa': 'Ріг',
-        'ріг': 'Ріг',
-    }
-    
-    if lower in special_cases:
-        return special_cases[lower]
+    special = _SPECIAL_CASES.get(lower)
+    if special:
+        return special
     
     # ============ CONSERVATIVE: Don't change if unsure ============
     # Words ending in -а, -и, -і, -у could be nominative, leave as is
@@ -300,9 +319,12 @@ def _capitalize(word: str) -> str:
     return word
 
 
+@lru_cache(maxsize=512)
 def normalize_region(region: str) -> Optional[str]:
     """
     Normalize region name to standard format "Назва обл."
+    
+    Memoized: the same few dozen region spellings repeat in every message.
     """
     if not region:
         return None
@@ -310,35 +332,36 @@ def normalize_region(region: str) -> Optional[str]:
     region = region.strip()
     
     # Check alias mapping
-    if region in REGION_ALIASES:
-        return REGION_ALIASES[region]
+    alias_region = REGION_ALIASES_LOWER.get(region.lower())
+    if alias_region:
+        return alias_region
     
     # Fix double "обл"
-    region = re.sub(r'\s+обл\.?\s+обл\.?', ' обл.', region, flags=re.IGNORECASE)
+    region = _DOUBLE_OBL.sub(' обл.', region)
     
     # Replace "область" with "обл."
     region = region.replace(' область', ' обл.').replace(' Область', ' обл.')
     
     # Ensure ends with "обл."
     if not region.endswith('обл.') and not region.endswith('обл'):
-        if any(x in region.lower() for x in ['ська', 'цька', 'зька']):
+        region_lower = region.lower()
+        if any(x in region_lower for x in ('ська', 'цька', 'зька')):
             region = region.rstrip('.') + ' обл.'
     
     # Add period if missing
     if region.endswith(' обл'):
         region = region + '.'
     
-    # Capitalize
-    if region:
-        region = region[0].upper() + region[1:]
-    
-    return region
+    return _capitalize(region)
 
 
 def extract_region_from_alias(text: str) -> Optional[str]:
     """Extract region from text containing regional alias."""
-    for alias, region in REGION_ALIASES.items():
-        if alias.lower() in text.lower():
+    text_lower = text.lower()
+    if not _REGION_ALIAS_ANY.search(text_lower):
+        return None
+    for alias, region in _REGION_ALIASES_LOWER:
+        if alias in text_lower:
             return region
     return None
 
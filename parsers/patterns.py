@@ -14,6 +14,18 @@ def _compile(pattern: str, flags: int = _FLAGS) -> Pattern:
     return re.compile(pattern, flags)
 
 
+def _lowercase_union(*patterns: Pattern) -> Pattern:
+    """
+    Case-sensitive union of IGNORECASE patterns, for text that is already lowercased.
+    
+    Avoids per-character case folding inside the regex engine.
+    """
+    sources = [p.pattern for p in patterns]
+    if any(re.search(r'\\[A-Z]', src) for src in sources):
+        raise ValueError("Uppercase escapes change meaning when lowercased")
+    return re.compile('|'.join(f'(?:{src.lower()})' for src in sources))
+
+
 class PatternGroup:
     """Group of related patterns for a threat type."""
     
@@ -48,7 +60,7 @@ class PatternGroup:
 # ============================================================================
 CLEAN = PatternGroup({
     'markdown': _compile(r'\*\*|__|~~'),
-    'urls': _compile(r'https?://[^\s]+'),
+    'urls': _compile(r'https?://\S+'),
     'usernames': _compile(r'@\w+'),
     'emoji_only_line': _compile(r'^[➡️⬅️↗️↘️↖️↙️⬆️⬇️🇺🇦\s|]+$'),
     'skip_keywords': _compile(r'Підписатися|ППОшник|Моніторинг 24/7|Радар України'),
@@ -279,8 +291,10 @@ LOCATION = PatternGroup({
 # ============================================================================
 KAB = PatternGroup({
     # "Загроза застосування КАБів"
+    # (?<![^\n]) pins the match to a line start: the earliest match always begins there,
+    # and it stops search() from retrying the lazy groups at every offset
     'zagroza_kab': _compile(
-        r'(.+?)\s*\((.+?обл\.?)\)\s*'
+        r'(?<![^\n])(.+?)\s*\((.+?обл\.?)\)\s*'
         r'Загроза\s+застосування\s+КАБів'
     ),
     
@@ -328,12 +342,31 @@ ROCKET = PatternGroup({
     
     # "Загроза високошвидкісних цілей"
     'vysokoshvydkisni': _compile(
-        r'(.+?)\s*\((.+?обл\.?)\)[\s\n]*'
+        r'(?<![^\n])(.+?)\s*\((.+?обл\.?)\)[\s\n]*'
         r'Загроза\s+застосування\s+високошвидкісних\s+цілей'
     ),
 })
 
 
+# ============================================================================
+# EXPLOSION PATTERNS
+# ============================================================================
+EXPLOSION = PatternGroup({
+    # "City (Region) ... вибухи"
+    'city_region_vybukhy': _compile(
+        r'^[⚠️❗️💥\s]*(.+?)\s*\((.+?обл\.?)\)[\s\n]*(?:ЗМІ\s+)?повідомляють\s+про\s+вибухи',
+        _FLAGS | re.MULTILINE
+    ),
+    
+    # "💥 City (Region) ... Загроза обстрілу"
+    'city_region_obstril': _compile(
+        r'^[💥⚠️❗️\s]*(.+?)\s*\((.+?обл\.?)\)[\s\n]*'
+        r'Загроза\s+обстрілу',
+        _FLAGS | re.MULTILINE
+    ),
+})
+
+
 # ============================================================================
 # REGION HEADER PATTERNS
 # ============================================================================
@@ -370,6 +403,23 @@ SKIP = PatternGroup({
 })
 
 
+# ============================================================================
+# MESSAGE GATES (match against lowercased text)
+# ============================================================================
+GATE = PatternGroup({
+    # General air-raid alert / shelter instruction
+    'alert': _lowercase_union(SKIP['alerts'], SKIP['shelter']),
+    # Any threat or launch keyword
+    'threat': _lowercase_union(
+        THREAT_TYPE['recon'], THREAT_TYPE['bpla'], THREAT_TYPE['rocket'], THREAT_TYPE['kab'],
+        THREAT_TYPE['ballistic'], THREAT_TYPE['explosion'], LAUNCH['keywords']
+    ),
+    # Ballistic threat wording and high-speed target warnings (classify_threat)
+    'ballistic': _lowercase_union(ROCKET['zagroza_ballistyka'], ROCKET['ballistika_na']),
+    'high_speed': _lowercase_union(ROCKET['vysokoshvydkisni']),
+})
+
+
 # ============================================================================
 # DIRECTION WORDS (to filter out from city names)
 # ============================================================================
@@ -390,9 +440,11 @@ class Patterns:
     location = LOCATION
     kab = KAB
     rocket = ROCKET
+    explosion = EXPLOSION
     region_header = REGION_HEADER
     quantity = QUANTITY
     skip = SKIP
+    gate = GATE
     direction_words = DIRECTION_WORDS
 
 
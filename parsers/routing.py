@@ -29,19 +29,30 @@ def route_message(text: str, channel: str = None) -> List[Event]:
         return []
 
     # Skip general alerts/shelter instructions only if no threat keywords
-    is_alert = PATTERNS.skip['alerts'].search(normalized) or PATTERNS.skip['shelter'].search(normalized)
-    has_threat = (
-        PATTERNS.threat_type.match_any(normalized)
-        or PATTERNS.launch['keywords'].search(normalized)
-    )
+    normalized_lower = normalized.lower()
+    is_alert = PATTERNS.gate['alert'].search(normalized_lower)
+    has_threat = PATTERNS.gate['threat'].search(normalized_lower)
     if is_alert and not has_threat:
         return []
     
+    return route_normalized(normalized, channel, text)
+
+
+def route_normalized(normalized: str, channel: str = None, raw_text: str = None) -> List[Event]:
+    """
+    Apply rules to text already passed through normalize_text and the alert gate.
+    
+    Lets callers that normalize and gate messages themselves (the dispatcher)
+    skip doing it twice.
+    """
+    if not normalized:
+        return []
+    
     # 1. Ballistic all-clear
     if PATTERNS.rocket['vidbiy_ballistyka'].search(normalized):
         return [Event(
             type=ThreatType.BALLISTIC,
-            raw_text=text,
+            raw_text=raw_text if raw_text is not None else normalized,
             source=channel or "",
             confidence=0.95
         )]
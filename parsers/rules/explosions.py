@@ -1,13 +1,12 @@
 """
 Explosion parsing rules.
 """
-import re
 from typing import List
 from core.event import Event
 from core.constants import ThreatType
 from parsers.patterns import PATTERNS
 from parsers.normalize import normalize_city, normalize_region
-from parsers.entity_extraction import get_region_for_city
+from parsers.entity_extraction import resolve_city
 
 
 def parse_explosions(text: str, channel: str = None) -> List[Event]:
@@ -23,11 +22,7 @@ def parse_explosions(text: str, channel: str = None) -> List[Event]:
     events: List[Event] = []
     
     # "City (Region) ... вибухи"
-    match = re.search(
-        r'^[⚠️❗️💥\s]*(.+?)\s*\((.+?обл\.?)\)[\s\n]*(?:ЗМІ\s+)?повідомляють\s+про\s+вибухи',
-        text,
-        re.IGNORECASE | re.MULTILINE
-    )
+    match = PATTERNS.explosion['city_region_vybukhy'].search(text)
     if match:
         city = normalize_city(match.group(1))
         region = normalize_region(match.group(2))
@@ -47,7 +42,7 @@ def parse_explosions(text: str, channel: str = None) -> List[Event]:
     if match:
         city = normalize_city(match.group(1))
         if city:
-            region = get_region_for_city(city)
+            city, region = resolve_city(city)
             if region:
                 events.append(Event(
                     type=ThreatType.EXPLOSION,
@@ -60,12 +55,7 @@ def parse_explosions(text: str, channel: str = None) -> List[Event]:
         return events
 
     # "💥 City (Region) ... Загроза обстрілу"
-    match = re.search(
-        r'^[💥⚠️❗️\s]*(.+?)\s*\((.+?обл\.?)\)[\s\n]*'
-        r'Загроза\s+обстрілу',
-        text,
-        re.IGNORECASE | re.MULTILINE
-    )
+    match = PATTERNS.explosion['city_region_obstril'].search(text)
     if match:
         city = normalize_city(match.group(1))
         region = normalize_region(match.group(2))
@@ -6,9 +6,11 @@ from core.event import Event
 from core.constants import ThreatType
 from parsers.patterns import PATTERNS
 from parsers.normalize import normalize_city, normalize_region
-from parsers.entity_extraction import get_region_for_city
+from parsers.entity_extraction import resolve_city
 import re
 
+CITY_SEPARATOR_RE = re.compile(r'[/,]')
+
 
 def parse_kab(text: str, channel: str = None) -> List[Event]:
     """Parse KAB-related messages."""
@@ -53,11 +55,11 @@ def _parse_aviatsiya(text: str, channel: str) -> List[Event]:
     
     events: List[Event] = []
     cities_part = match.group(1).strip()
-    for city in re.split(r'[/,]', cities_part):
+    for city in CITY_SEPARATOR_RE.split(cities_part):
         city = normalize_city(city.strip())
         if not city:
             continue
-        region = get_region_for_city(city)
+        city, region = resolve_city(city)
         if not region:
             continue
         events.append(Event(
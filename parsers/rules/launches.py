@@ -9,22 +9,30 @@ from core.constants import ThreatType
 from parsers.patterns import PATTERNS
 from parsers.normalize import normalize_city
 
+TRAILING_PUNCT_RE = re.compile(r'[\s\.,;:!]+$')
+PARENS_RE = re.compile(r'\(.*?\)')
+MULTI_SPACE_RE = re.compile(r'\s{2,}')
+STANDALONE_LOCATION_RE = re.compile(r'^[А-ЯІЇЄҐа-яіїєґ\'\-\s]+$')
+# Words that mark a short line as a header/notice rather than a launch location
+NOT_LOCATION_RE = re.compile(r'радар|україна|ппо|моніторинг|є рух|виконується|пуск|бпла')
+
 
 def parse_launches(text: str, channel: str = None) -> List[Event]:
     """Parse launch-related messages and return launch events."""
     if not text:
         return []
 
-    lines = [l.strip() for l in text.split('\n') if l.strip()]
-    if not any(PATTERNS.launch['keywords'].search(line) for line in lines):
+    lines = [l for l in map(str.strip, text.split('\n')) if l]
+    # Launch context starts at the first keyword line and lasts to the end
+    keywords = PATTERNS.launch['keywords']
+    context_start = next((i for i, line in enumerate(lines) if keywords.search(line)), None)
+    if context_start is None:
         return []
 
     locations = []
-    in_context = False
 
-    for line in lines:
-        if PATTERNS.launch['keywords'].search(line):
-            in_context = True
+    for i, line in enumerate(lines):
+        in_context = i >= context_start
         match = PATTERNS.launch['source_location'].search(line)
         if match:
             loc = _clean_launch_location(match.group(1))
@@ -62,11 +70,11 @@ def _clean_launch_location(raw: str) -> str:
     if not raw:
         return ""
     cleaned = raw.strip()
-    cleaned = re.sub(r'[\s\.,;:!]+$', '', cleaned)
-    cleaned = re.sub(r'\(.*?\)', '', cleaned).strip()
+    cleaned = TRAILING_PUNCT_RE.sub('', cleaned)
+    cleaned = PARENS_RE.sub('', cleaned).strip()
     cleaned = cleaned.replace('аеродром', '').replace('аеродрому', '').replace('аеродрома', '')
     cleaned = cleaned.replace('ае', '').replace('а/е', '').strip()
-    cleaned = re.sub(r'\s{2,}', ' ', cleaned)
+    cleaned = MULTI_SPACE_RE.sub(' ', cleaned)
     return normalize_city(cleaned)
 
 
@@ -85,10 +93,8 @@ def _dedup(items: List[str]) -> List[str]:
 def _is_standalone_location(line: str) -> bool:
     if not line or len(line) < 3:
         return False
-    if any(x in line.lower() for x in [
-        'радар', 'україна', 'ппо', 'моніторинг', 'є рух', 'виконується', 'пуск', 'бпла'
-    ]):
+    if NOT_LOCATION_RE.search(line.lower()):
         return False
     if len(line.split()) > 3:
         return False
-    return bool(re.match(r'^[А-ЯІЇЄҐа-яіїєґ\'\-\s]+$', line))
+    return bool(STANDALONE_LOCATION_RE.match(line))
@@ -7,7 +7,7 @@ from core.event import Event
 from core.constants import ThreatType
 from parsers.patterns import PATTERNS
 from parsers.normalize import normalize_city, normalize_region
-from parsers.entity_extraction import get_region_for_city
+from parsers.entity_extraction import resolve_city
 
 
 def parse_rockets(text: str, channel: str = None) -> List[Event]:
@@ -54,7 +54,7 @@ def _parse_rocket_city(text: str, channel: str) -> List[Event]:
         return []
     
     city = normalize_city(match.group(1))
-    region = get_region_for_city(city)
+    city, region = resolve_city(city)
     if not city or not region:
         return []
     
@@ -74,7 +74,7 @@ def _parse_ballistic_city(text: str, channel: str) -> List[Event]:
         return []
     
     city = normalize_city(match.group(1))
-    region = get_region_for_city(city)
+    city, region = resolve_city(city)
     if not city or not region:
         return []
     
@@ -116,7 +116,7 @@ def _parse_grupa_kr(text: str, channel: str) -> List[Event]:
     
     count = int(match.group(1)) if match.group(1) else None
     city = normalize_city(match.group(2).strip())
-    region = get_region_for_city(city)
+    city, region = resolve_city(city)
     if not city or not region:
         return []
     
@@ -0,0 +1,26 @@
+from core import cache as cache_module
+from core.cache import DeduplicationCache
+
+
+def test_check_and_add_detects_duplicate():
+    cache = DeduplicationCache(ttl_seconds=60)
+    assert not cache.check_and_add("київ_БПЛА")
+    assert cache.check_and_add("київ_БПЛА")
+
+
+def test_expired_entries_dropped_oldest_first(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    cache = DeduplicationCache(ttl_seconds=60)
+    cache.add("a")
+    now[0] = 1030.0
+    cache.add("b")
+    now[0] = 1050.0
+    cache.add("a")  # re-adding refreshes the entry and moves it to the end
+
+    now[0] = 1070.0
+    assert cache.size == 2
+    now[0] = 1091.0
+    assert not cache.is_duplicate("b")
+    assert cache.is_duplicate("a")
+    assert cache.size == 1
@@ -1,9 +1,15 @@
 """Tests for message dispatcher."""
+import asyncio
+import json
+import time
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from telethon.tl.types import PeerChannel
 
+from core.event import Event, ThreatType
+from ingest import dispatcher as dispatcher_module
 from ingest.dispatcher import MessageDispatcher
 from ingest.telegram_client import IncomingMessage, TelegramIngestClient
 
@@ -83,3 +89,320 @@ async def test_dispatcher_stats(dispatcher, mock_telegram):
     assert stats["processed"] >= 1
     assert stats["sent"] >= 1
     assert "cache_size" in stats
+
+
+@pytest.mark.asyncio
+async def test_enrich_regions_geocodes_each_city_once(monkeypatch):
+    """Repeated cities in one message share a single geocode lookup."""
+    geocode = AsyncMock(return_value="Сумська обл.")
+    monkeypatch.setattr(dispatcher_module, "geocode_city", geocode)
+    events = [
+        Event(type=ThreatType.BPLA, city="Тестове"),
+        Event(type=ThreatType.KAB, city="Тестове"),
+    ]
+
+    await dispatcher_module._enrich_regions(events)
+
+    geocode.assert_awaited_once_with("Тестове")
+    assert [e.region for e in events] == ["Сумська обл.", "Сумська обл."]
+
+
+@pytest.mark.asyncio
+async def test_enrich_regions_resolves_known_cities_locally(monkeypatch):
+    """Cities in the local dictionary never reach the geocoders."""
+    geocode = AsyncMock(return_value=None)
+    monkeypatch.setattr(dispatcher_module, "geocode_city", geocode)
+    events = [Event(type=ThreatType.BPLA, city="Суми")]
+
+    await dispatcher_module._enrich_regions(events)
+
+    geocode.assert_not_awaited()
+    assert events[0].region == "Сумська обл."
+
+
+@pytest.mark.asyncio
+async def test_process_message_non_cyrillic_skipped(dispatcher, mock_telegram):
+    """Messages without Ukrainian words are dropped before parsing."""
+    msg = make_message("Subscribe: https://t.me/example @example", msg_id=20)
+    sent = await dispatcher.process_message(msg)
+    assert sent == 0
+    mock_telegram.send_message.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_process_message_off_topic_skipped_before_parsing(dispatcher, mock_telegram, monkeypatch):
+    """Messages without threat keywords or region context never reach the rules."""
+    route = MagicMock(return_value=[])
+    monkeypatch.setattr(dispatcher_module, "route_normalized", route)
+    sent = await dispatcher.process_message(make_message("Доброго ранку, друзі! Підтримайте канал", msg_id=21))
+    assert sent == 0
+    route.assert_not_called()
+
+    # A region header without threat keywords still has to be parsed
+    await dispatcher.process_message(make_message("Чернігівщина:\n→Короп/Бахмач(2х)", msg_id=22))
+    route.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_polling_loop_hands_messages_to_workers(dispatcher, mock_telegram):
+    """Polled messages are processed by background workers."""
+    async def poll_once():
+        yield make_message("БПЛА Харків (Харківська обл.)", msg_id=30)
+
+    mock_telegram.poll_new_messages = poll_once
+    mock_telegram.poll_interval = 3600
+
+    task = asyncio.create_task(dispatcher.run_polling_loop())
+    for _ in range(100):
+        if mock_telegram.send_message.called:
+            break
+        await asyncio.sleep(0.01)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    mock_telegram.send_message.assert_called()
+
+
+@pytest.mark.asyncio
+async def test_process_message_sends_alerts_in_order(dispatcher, mock_telegram):
+    """A message's alerts are posted in text order; only the first carries the media."""
+    msg = make_message("Сумщина:\n▪️2 на Конотоп\n▪️1 на Шостку\n▪️1 на Ромни", msg_id=50)
+    msg.has_media = True
+    msg.raw_message.media = "photo"
+
+    assert await dispatcher.process_message(msg) == 3
+    assert [c.args for c in mock_telegram.send_message.call_args_list] == [
+        ("БПЛА Конотоп (Сумська обл.)", "photo"),
+        ("БПЛА Шостка (Сумська обл.)", None),
+        ("БПЛА Ромни (Сумська обл.)", None),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_queued_messages_keep_order_and_are_never_dropped(dispatcher, monkeypatch):
+    """A full queue applies backpressure; each channel is processed in arrival order."""
+    monkeypatch.setattr(dispatcher_module, "PROCESS_QUEUE_SIZE", 1)
+    processed = []
+
+    async def process_message(message):
+        await asyncio.sleep(0.001 if message.id % 2 else 0.005)
+        processed.append((message.channel, message.id))
+        return 0
+
+    monkeypatch.setattr(dispatcher, "process_message", process_message)
+    workers = {}
+    for msg_id in range(1, 9):
+        await dispatcher._enqueue(workers, make_message("x", channel="a", msg_id=msg_id))
+        await dispatcher._enqueue(workers, make_message("x", channel="b", msg_id=msg_id))
+    for queue, _ in workers.values():
+        await queue.join()
+    await dispatcher._stop_workers(workers)
+
+    assert [i for channel, i in processed if channel == "a"] == list(range(1, 9))
+    assert [i for channel, i in processed if channel == "b"] == list(range(1, 9))
+
+
+@pytest.mark.asyncio
+async def test_event_loop_catches_up_after_disconnect(dispatcher, mock_telegram):
+    """After a disconnect the event loop reconnects and polls for missed messages."""
+    polls = []
+
+    async def poll_once():
+        # Nothing new at startup; the message arrives while disconnected
+        polls.append(1)
+        if len(polls) > 1:
+            yield make_message("БПЛА Харків (Харківська обл.)", msg_id=40)
+
+    disconnects = []
+
+    async def run_until_disconnected():
+        # First connection drops at once, the second stays up
+        disconnects.append(1)
+        if len(disconnects) > 1:
+            await asyncio.Event().wait()
+
+    mock_telegram.run_until_disconnected = run_until_disconnected
+    mock_telegram.ensure_connected = AsyncMock(return_value=True)
+    mock_telegram.poll_interval = 0
+    mock_telegram.poll_new_messages = poll_once
+
+    task = asyncio.create_task(dispatcher.run_event_loop())
+    for _ in range(100):
+        if mock_telegram.send_message.called:
+            break
+        await asyncio.sleep(0.01)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    mock_telegram.ensure_connected.assert_awaited_once()
+    mock_telegram.send_message.assert_called()
+
+
+@pytest.mark.asyncio
+async def test_event_loop_reconnects_after_disconnect_error(dispatcher, mock_telegram):
+    """An error raised by run_until_disconnected leads to reconnect and catch-up, not exit."""
+    polls = []
+
+    async def poll_once():
+        # Nothing new at startup; the message arrives while disconnected
+        polls.append(1)
+        if len(polls) > 1:
+            yield make_message("БПЛА Харків (Харківська обл.)", msg_id=41)
+
+    calls = []
+
+    async def run_until_disconnected():
+        # Telethon re-raises the disconnection error once its reconnects give up
+        calls.append(1)
+        if len(calls) == 1:
+            raise ConnectionError("Automatic reconnection failed")
+        await asyncio.Event().wait()
+
+    mock_telegram.poll_interval = 0
+    mock_telegram.run_until_disconnected = run_until_disconnected
+    mock_telegram.ensure_connected = AsyncMock(return_value=True)
+    mock_telegram.poll_new_messages = poll_once
+
+    task = asyncio.create_task(dispatcher.run_event_loop())
+    for _ in range(100):
+        if mock_telegram.send_message.called:
+            break
+        await asyncio.sleep(0.01)
+    assert not task.done()
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    mock_telegram.ensure_connected.assert_awaited_once()
+    mock_telegram.send_message.assert_called()
+
+
+@pytest.mark.asyncio
+async def test_event_loop_backs_off_when_connection_keeps_dropping(dispatcher, mock_telegram, monkeypatch):
+    """Quick disconnects, clean or not, are retried with a growing delay instead of spinning."""
+    sleep = AsyncMock()
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+    calls = []
+
+    async def run_until_disconnected():
+        calls.append(1)
+        if len(calls) == 2:
+            raise ConnectionError("connection lost")
+        if len(calls) > 5:
+            raise asyncio.CancelledError
+
+    async def poll_nothing():
+        return
+        yield
+
+    mock_telegram.run_until_disconnected = run_until_disconnected
+    mock_telegram.ensure_connected = AsyncMock(return_value=True)
+    mock_telegram.poll_new_messages = poll_nothing
+
+    await dispatcher.run_event_loop()
+
+    assert [c.args[0] for c in sleep.await_args_list] == [30, 60, 120, 240, 240]
+
+
+@pytest.mark.asyncio
+async def test_event_loop_catches_up_from_saved_offsets_at_startup(tmp_path):
+    """Messages posted while the process was down are fetched before push updates start."""
+    offsets_file = tmp_path / "offsets.json"
+    offsets_file.write_text(json.dumps({"saved_at": time.time(), "offsets": {"source": 10}}))
+    telegram = TelegramIngestClient(
+        api_id=1,
+        api_hash="hash",
+        session_string="",
+        source_channels=["source"],
+        target_channel="target",
+        offsets_file=str(offsets_file),
+    )
+    telegram._client = MagicMock()
+    telegram._client.get_entity = AsyncMock(return_value=PeerChannel(channel_id=123))
+    telegram._entities["source"] = PeerChannel(channel_id=123)
+    await telegram.seed_last_message_ids()  # restored offset is kept, not re-seeded
+    telegram.ensure_connected = AsyncMock(return_value=True)
+    raws = []
+    for msg_id in (12, 11):  # newest first, as Telegram returns them
+        raw = make_message("", msg_id=msg_id).raw_message
+        raw.id, raw.text, raw.date = msg_id, "", datetime.now()
+        raws.append(raw)
+    telegram._client.get_messages = AsyncMock(return_value=raws)
+    telegram._client.run_until_disconnected = AsyncMock(side_effect=asyncio.Event().wait)
+
+    dispatcher = MessageDispatcher(telegram_client=telegram, dedup_ttl=60)
+    processed = []
+
+    async def process_message(message):
+        processed.append(message.id)
+        return 0
+
+    dispatcher.process_message = process_message
+
+    task = asyncio.create_task(dispatcher.run_event_loop())
+    for _ in range(100):
+        if len(processed) == 2:
+            break
+        await asyncio.sleep(0.01)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    await telegram.flush_offsets()
+
+    assert telegram._client.get_messages.await_args.kwargs["min_id"] == 10
+    assert processed == [11, 12]
+    assert telegram._last_message_ids == {"source": 12}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["poll", "events"])
+async def test_restart_fetches_gap_from_saved_offsets(tmp_path, monkeypatch, mode):
+    """Offsets saved by a previous run are restored and the gap is fetched in both ingest modes."""
+    offsets_file = tmp_path / "offsets.json"
+    offsets_file.write_text(json.dumps({"saved_at": time.time(), "offsets": {"source": 10}}))
+    raws = []
+    for msg_id in (12, 11):
+        raw = make_message("", msg_id=msg_id).raw_message
+        raw.id, raw.text, raw.date = msg_id, "", datetime.now()
+        raws.append(raw)
+    clients = []
+
+    class FakeClient(TelegramIngestClient):
+        async def connect(self):
+            self._client = MagicMock()
+            self._client.get_messages = AsyncMock(side_effect=[raws] + [[]] * 100)
+            self._client.run_until_disconnected = AsyncMock(side_effect=asyncio.Event().wait)
+            self.ensure_connected = AsyncMock(return_value=True)
+            clients.append(self)
+            return True
+
+        async def validate_channels(self):
+            self._entities["source"] = PeerChannel(channel_id=123)
+            return ["source"], None
+
+        async def disconnect(self):
+            pass
+
+    processed = []
+
+    async def process_message(self, message):
+        processed.append(message.id)
+        return 0
+
+    monkeypatch.setattr(dispatcher_module, "TelegramIngestClient", FakeClient)
+    monkeypatch.setattr(dispatcher_module, "flush_cache", AsyncMock())
+    monkeypatch.setattr(dispatcher_module, "close_session", AsyncMock())
+    monkeypatch.setattr(MessageDispatcher, "process_message", process_message)
+
+    task = asyncio.create_task(dispatcher_module.create_and_run_dispatcher(
+        api_id=1, api_hash="hash", session="", sources=["source"], target="target",
+        poll_interval=0, mode=mode, offsets_file=str(offsets_file),
+    ))
+    for _ in range(100):
+        if len(processed) == 2:
+            break
+        await asyncio.sleep(0.01)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    # Restored offset is used as-is, not re-seeded from the latest message
+    assert clients[0]._client.get_messages.await_args_list[0].kwargs["min_id"] == 10
+    assert processed == [11, 12]
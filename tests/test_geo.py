@@ -1,7 +1,25 @@
 """Tests for geocoding utilities."""
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from unittest.mock import AsyncMock, MagicMock
+
 import pytest
 
-from utils.geo import get_region_for_city, geocode_city_sync
+from utils import geo
+from utils.geo import geocode_city_sync, get_region_for_city
+
+
+@pytest.fixture
+def isolated_geo(monkeypatch):
+    """Empty in-memory geocode cache, no API keys, no disk writes."""
+    monkeypatch.setattr(geo, "VISICOM_API_KEY", "")
+    monkeypatch.setattr(geo, "OPENCAGE_API_KEY", "")
+    monkeypatch.setattr(geo, "_cache", {})
+    monkeypatch.setattr(geo, "_cache_times", {})
+    monkeypatch.setattr(geo, "_negative_cache", OrderedDict())
+    monkeypatch.setattr(geo, "_schedule_cache_save", MagicMock())
 
 
 def test_get_region_for_city_known_cities():
@@ -20,6 +38,28 @@ def test_get_region_for_city_case_insensitive():
     assert get_region_for_city("КИЇВ") == "Київська обл."
 
 
+def test_get_region_for_city_trailing_punctuation():
+    """Trailing punctuation does not defeat local lookup."""
+    assert get_region_for_city("Суми,") == "Сумська обл."
+    assert geocode_city_sync("Харків.") == "Харківська обл."
+
+
+def test_get_region_for_city_typographic_apostrophe():
+    """Typographic apostrophes match the ASCII spelling in CITIES."""
+    assert get_region_for_city("Слов’янськ") == "Донецька обл."
+    assert geocode_city_sync("КУПʼЯНСЬК") == "Харківська обл."
+
+
+def test_get_region_for_city_oblique_case():
+    """Genitive/accusative/locative forms resolve locally like the nominative."""
+    assert get_region_for_city("Богодухова") == "Харківська обл."
+    assert get_region_for_city("Полтаву") == "Полтавська обл."
+    assert get_region_for_city("Хмельницького") == "Хмельницька обл."
+    assert geocode_city_sync("Лозової") == "Харківська обл."
+    assert get_region_for_city("Канева") == "Черкаська обл."
+    assert get_region_for_city("Золочева") == "Харківська обл."
+
+
 def test_get_region_for_city_with_hint():
     """Hint is returned when city not in CITIES or cache."""
     result = get_region_for_city("UnknownCity123", hint="Харківська обл.")
@@ -46,3 +86,160 @@ def test_geocode_city_sync_hint():
 def test_geocode_city_sync_short_city():
     """Very short city names return None."""
     assert geocode_city_sync("ab") is None
+
+
+@pytest.mark.asyncio
+async def test_geocoder_session_is_shared():
+    """Geocoders reuse one HTTP session until it is closed."""
+    session = geo._get_session()
+    assert geo._get_session() is session
+    await geo.close_session()
+    assert session.closed
+    assert geo._session is None
+
+
+def test_geocoder_session_is_per_event_loop():
+    """Each event loop gets its own session; close_session() releases it before the loop ends."""
+    async def get_session():
+        session = geo._get_session()
+        await geo.close_session()
+        return session
+
+    first = asyncio.run(get_session())
+    assert first.closed
+
+    async def check():
+        second = geo._get_session()
+        assert second is not first
+        await geo.close_session()
+
+    asyncio.run(check())
+
+
+def test_stale_session_from_stopped_loop_is_dropped_not_closed():
+    """A session whose loop has stopped is not closed from another loop."""
+    session = MagicMock()
+    stopped = asyncio.new_event_loop()
+    stopped.close()
+
+    geo._close_stale_session(session, stopped)
+
+    session.close.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_save_cache_async_writes_snapshot(tmp_path, monkeypatch):
+    """Cache is written to disk off the event loop."""
+    cache_file = tmp_path / "geocode_cache.json"
+    monkeypatch.setattr(geo, "_cache_file", str(cache_file))
+    monkeypatch.setattr(geo, "_cache", {"тестове": "Сумська обл."})
+    monkeypatch.setattr(geo, "_cache_times", {"тестове": 1000.0})
+
+    await geo._save_cache_async()
+    assert json.loads(cache_file.read_text(encoding="utf-8")) == {
+        "тестове": {"region": "Сумська обл.", "ts": 1000.0}
+    }
+
+
+def test_load_cache_drops_expired_entries(tmp_path, monkeypatch, isolated_geo):
+    """Entries older than CACHE_TTL are not loaded; old-format entries are kept."""
+    cache_file = tmp_path / "geocode_cache.json"
+    cache_file.write_text(json.dumps({
+        "свіже": {"region": "Сумська обл.", "ts": time.time()},
+        "старе": {"region": "Сумська обл.", "ts": time.time() - geo.CACHE_TTL - 1},
+        "без часу": "Київська обл.",
+    }), encoding="utf-8")
+    monkeypatch.setattr(geo, "_cache_file", str(cache_file))
+
+    geo._load_cache()
+    assert set(geo._cache) == {"свіже", "без часу"}
+
+
+def test_cache_put_evicts_oldest_beyond_limit(monkeypatch, isolated_geo):
+    """Cache is bounded; the oldest stored entries are evicted first."""
+    monkeypatch.setattr(geo, "CACHE_MAX_ENTRIES", 2)
+
+    geo._cache_put("перше", "Сумська обл.")
+    geo._cache_put("друге", "Сумська обл.")
+    geo._cache_put("третє", None)
+    assert list(geo._cache) == ["друге", "третє"]
+    assert set(geo._cache_times) == {"друге", "третє"}
+
+
+@pytest.mark.asyncio
+async def test_geocode_city_skips_recent_miss(monkeypatch, isolated_geo):
+    """A city all geocoders failed on is not re-queried within the TTL."""
+    nominatim = AsyncMock(return_value=None)
+    monkeypatch.setattr(geo, "_nominatim_geocode", nominatim)
+
+    assert await geo.geocode_city("Невідомівка") is None
+    assert await geo.geocode_city("Невідомівка") is None
+    nominatim.assert_awaited_once()
+
+    monkeypatch.setattr(geo, "NEGATIVE_CACHE_TTL", 0)
+    assert await geo.geocode_city("Невідомівка") is None
+    assert nominatim.await_count == 2
+
+
+def test_negative_cache_prunes_expired_and_oldest_misses(monkeypatch, isolated_geo):
+    """Misses are bounded: expired ones are dropped on insert, then the oldest beyond the limit."""
+    monkeypatch.setattr(geo, "CACHE_MAX_ENTRIES", 2)
+    geo._negative_cache["давнє"] = time.monotonic() - geo.NEGATIVE_CACHE_TTL - 1
+
+    geo._negative_put("перше")
+    assert list(geo._negative_cache) == ["перше"]
+
+    geo._negative_put("друге")
+    geo._negative_put("третє")
+    assert list(geo._negative_cache) == ["друге", "третє"]
+
+
+@pytest.mark.asyncio
+async def test_session_has_default_timeout_and_user_agent():
+    """Timeout, User-Agent and connection pool are configured once on the shared session."""
+    await geo.close_session()
+    session = geo._get_session()
+    try:
+        assert session.timeout.total == 5
+        assert session.headers["User-Agent"].startswith("TelegramForwarder")
+        assert session.connector.limit_per_host == 2
+    finally:
+        await geo.close_session()
+
+
+@pytest.mark.asyncio
+async def test_cache_save_is_debounced(monkeypatch):
+    """A burst of new results schedules a single delayed write; flush_cache writes pending ones."""
+    save = AsyncMock()
+    monkeypatch.setattr(geo, "_save_cache_async", save)
+    monkeypatch.setattr(geo, "CACHE_FLUSH_DELAY", 0)
+    monkeypatch.setattr(geo, "_cache_flush", None)
+
+    for _ in range(3):
+        geo._schedule_cache_save()
+    await geo._cache_flush
+    save.assert_awaited_once()
+
+    monkeypatch.setattr(geo, "CACHE_FLUSH_DELAY", 60)
+    geo._schedule_cache_save()
+    await geo.flush_cache()
+    assert save.await_count == 2
+    assert geo._cache_flush is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_geocode_calls_share_one_lookup(monkeypatch, isolated_geo):
+    """Simultaneous lookups of the same unknown city hit the geocoder once."""
+    calls = []
+
+    async def nominatim(city):
+        calls.append(city)
+        await asyncio.sleep(0)
+        return "Сумська обл."
+
+    monkeypatch.setattr(geo, "_nominatim_geocode", nominatim)
+
+    results = await asyncio.gather(*(geo.geocode_city("Невідомівка") for _ in range(3)))
+    assert results == ["Сумська обл."] * 3
+    assert calls == ["Невідомівка"]
+    assert not geo._inflight
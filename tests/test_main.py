@@ -0,0 +1,30 @@
+"""Tests for the application entry point."""
+import asyncio
+import os
+import signal
+
+import pytest
+
+import main
+
+
+@pytest.mark.asyncio
+async def test_sigterm_cancels_run_so_cleanup_runs():
+    """SIGTERM cancels the dispatcher coroutine instead of killing the process, so finally blocks run."""
+    cleaned_up = asyncio.Event()
+
+    async def dispatcher():
+        try:
+            await asyncio.Event().wait()
+        finally:
+            cleaned_up.set()
+
+    task = asyncio.create_task(main._run_until_sigterm(dispatcher()))
+    await asyncio.sleep(0)
+    os.kill(os.getpid(), signal.SIGTERM)
+    await asyncio.gather(task, return_exceptions=True)
+
+    assert cleaned_up.is_set()
+    assert task.cancelled()
+    # The handler is removed again, so SIGTERM outside a run keeps its default action
+    assert not asyncio.get_running_loop().remove_signal_handler(signal.SIGTERM)
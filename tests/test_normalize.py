@@ -1,4 +1,7 @@
+import sys
+
 from parsers.normalize import normalize_city, normalize_region, normalize_text
+from utils.text import WHITESPACE_CHARS
 
 
 def test_normalize_text_strips_noise():
@@ -11,5 +14,30 @@ def test_normalize_city_cases():
     assert normalize_city("Кривого Рогу") == "Кривий Ріг"
 
 
+def test_normalize_city_known_city_unchanged():
+    assert normalize_city("Олешки") == "Олешки"
+    assert normalize_city("Золочів") == "Золочів"
+    assert normalize_city("Лозова") == "Лозова"
+
+
 def test_normalize_region_alias():
     assert normalize_region("Харківщина") == "Харківська обл."
+    assert normalize_region("ХАРКІВЩИНА") == "Харківська обл."
+
+
+def test_normalize_text_drops_arrow_only_lines():
+    assert normalize_text("➡️ ⬅️\n🇺🇦🇺🇦 | ➡️\nКиїв ➡️") == "Київ ➡️"
+    assert normalize_text("➡️\u2003⬅️\nКиїв") == "Київ"
+
+
+def test_normalize_text_memoized_for_reposts():
+    text = "Сумщина:\n2 на Конотоп\nhttps://t.me/x"
+    first = normalize_text(text)
+    hits = normalize_text.cache_info().hits
+    assert normalize_text(text) == first
+    assert normalize_text.cache_info().hits == hits + 1
+
+
+def test_whitespace_chars_match_str_isspace():
+    expected = "".join(c for c in map(chr, range(sys.maxunicode + 1)) if c.isspace())
+    assert expected == WHITESPACE_CHARS
@@ -24,3 +24,17 @@ def test_city_to_you_pattern():
 def test_launch_source_pattern():
     text = "Пуски БПЛА з Приморсько-Ахтарська"
     assert PATTERNS.launch["source_location"].search(text)
+
+
+def test_gate_patterns_match_lowercased_text():
+    assert PATTERNS.gate['alert'].search("повітряна тривога")
+    assert PATTERNS.gate['threat'].search("2 бпла на київ")
+    assert not PATTERNS.gate['threat'].search("відбій тривоги")
+
+
+def test_threat_block_patterns_start_at_line_start():
+    text = "Увага\nСуми (Сумська обл.)\nЗагроза застосування КАБів"
+    match = PATTERNS.kab["zagroza_kab"].search(text)
+    assert match.groups() == ("Суми", "Сумська обл.")
+    # Many unclosed "(... обл)" groups on one line used to backtrack for seconds
+    assert not PATTERNS.rocket["vysokoshvydkisni"].search("Харків (Харківська обл) " * 80)
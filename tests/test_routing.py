@@ -1,5 +1,11 @@
-from parsers.routing import route_message
+from unittest.mock import MagicMock
+
 from core.constants import ThreatType
+from parsers.entity_extraction import _extract_entities, extract_entities
+from parsers.normalize import normalize_text
+from parsers.routing import route_message, route_normalized
+from utils import geo
+from utils.geo import get_region_for_city
 
 
 def test_route_ballistic_all_clear():
@@ -23,6 +29,12 @@ def test_route_count_na_city_with_region_header():
     assert events[0].city == "Богодухів"
 
 
+def test_route_region_header_any_case():
+    events = route_message("ХАРКІВЩИНА:\n▪️2 на Богодухів", "test")
+    assert events
+    assert events[0].region == "Харківська обл."
+
+
 def test_route_arrow_multi_cities():
     text = "Чернігівщина:\n→Короп/Бахмач(2х)"
     events = route_message(text, "test")
@@ -54,3 +66,72 @@ def test_format_explosion_unified():
     msg = events[0].format_message()
     assert msg.startswith("Вибухи ")
     assert "Київ" in msg
+
+
+def test_oblique_city_emitted_in_nominative():
+    """Declined city names resolved locally are emitted and deduplicated as the CITIES name."""
+    assert [e.format_message() for e in route_message("Полтаву - вибухи")] == [
+        "Вибухи Полтава (Полтавська обл.)"
+    ]
+    assert [e.format_message() for e in route_message("Ракета на Тернополя")] == [
+        "Ракета Тернопіль (Тернопільська обл.)"
+    ]
+    declined = route_message("Ракета курсом на Кременчука")
+    assert [e.city for e in declined] == ["Кременчук"]
+    assert declined[0].dedup_key == route_message("Ракета курсом на Кременчук")[0].dedup_key
+    assert [e.city for e in route_message("Ракета курсом на Умані")] == ["Умань"]
+
+
+def test_region_adjectives_and_common_words_are_not_cities():
+    """Region adjectives and ordinary nouns that look like declined cities are not resolved."""
+    assert route_message("Донецька - вибухи") == []
+    assert route_message("Луганська - вибухи") == []
+    assert route_message("БпЛА курсом на Дніпра") == []
+    assert route_message("БпЛА курсом на затоку") == []
+    assert get_region_for_city("Дніпра") is None
+    assert get_region_for_city("затоку") is None
+    assert get_region_for_city("Середина-Буди") is None
+
+
+def test_oblique_forms_that_are_ordinary_words_are_not_cities():
+    """Declined forms shared with common nouns or hromada names resolve to no city."""
+    assert route_message("Ракета курсом на коропа") == []
+    assert route_message("Ракета курсом на Первомайську громаду") == []
+    for word in ("Коропа", "Коропі", "Первомайська", "Первомайську"):
+        assert get_region_for_city(word) is None
+    # The nominative names still resolve
+    assert [e.city for e in route_message("Ракета курсом на Короп")] == ["Короп"]
+    assert get_region_for_city("Первомайськ") == "Миколаївська обл."
+
+
+def test_extract_entities_memoized_returns_fresh_list():
+    text = "Чернігівщина:\n▪️2 на Богодухів"
+    first = extract_entities(text, "test")
+    first.clear()
+    second = extract_entities(text, "test")
+    assert second and second[0].city == "Богодухів"
+
+
+def test_extract_entities_memo_follows_geocode_cache_changes(monkeypatch):
+    monkeypatch.setattr(geo, "_cache", {"невідомівка": None})
+    monkeypatch.setattr(geo, "_cache_times", {})
+    monkeypatch.setattr(geo, "_schedule_cache_save", MagicMock())
+
+    text = "✈️ Невідомівка - обережно по БПЛА!"
+    assert extract_entities(text, "test") == []
+    # A new city elsewhere keeps memoised results; a changed one invalidates them
+    geo._cache_put("інше село", "Київська обл.")
+    hits = _extract_entities.cache_info().hits
+    assert extract_entities(text, "test") == []
+    assert _extract_entities.cache_info().hits == hits + 1
+    geo._cache_put("невідомівка", "Сумська обл.")
+    assert [(e.city, e.region) for e in extract_entities(text, "test")] == [
+        ("Невідомівка", "Сумська обл.")
+    ]
+
+
+def test_route_normalized_matches_route_message():
+    text = "**Чернігівщина:**\n▪️2 на Богодухів"
+    expected = [(e.type, e.city, e.region) for e in route_message(text, "test")]
+    actual = [(e.type, e.city, e.region) for e in route_normalized(normalize_text(text), "test", text)]
+    assert actual == expected
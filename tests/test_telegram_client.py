@@ -0,0 +1,310 @@
+"""Tests for Telegram ingest client."""
+import asyncio
+import json
+import os
+import time
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from telethon.errors import FloodWaitError
+from telethon.tl.types import PeerChannel
+from telethon.utils import get_peer_id
+
+from ingest import telegram_client
+from ingest.telegram_client import TelegramIngestClient
+
+
+def make_raw(msg_id: int, text: str = "") -> MagicMock:
+    raw = MagicMock()
+    raw.id = msg_id
+    raw.text = text
+    raw.date = datetime.now()
+    raw.media = None
+    return raw
+
+
+@pytest.fixture
+def client():
+    ingest = TelegramIngestClient(
+        api_id=1,
+        api_hash="hash",
+        session_string="",
+        source_channels=["source"],
+        target_channel="target",
+    )
+    ingest._client = MagicMock()
+    ingest._client.get_entity = AsyncMock(return_value=object())
+    ingest.ensure_connected = AsyncMock(return_value=True)
+    return ingest
+
+
+@pytest.mark.asyncio
+async def test_poll_seeds_last_id_on_first_run(client):
+    """First poll only records the latest message ID."""
+    client._client.get_messages = AsyncMock(return_value=[make_raw(10)])
+
+    messages = [m async for m in client.poll_new_messages()]
+
+    assert messages == []
+    assert client._last_message_ids["source"] == 10
+
+
+@pytest.mark.asyncio
+async def test_seed_at_startup_lets_first_poll_fetch_new_messages(client):
+    """Seeded channels fetch new messages on the very first poll."""
+    client._entities["source"] = object()
+    client._client.get_messages = AsyncMock(return_value=[make_raw(10)])
+    await client.seed_last_message_ids()
+    assert client._last_message_ids["source"] == 10
+
+    client._client.get_messages = AsyncMock(return_value=[make_raw(11, "a")])
+    messages = [m async for m in client.poll_new_messages()]
+
+    assert [m.id for m in messages] == [11]
+
+
+@pytest.mark.asyncio
+async def test_poll_yields_all_new_messages_oldest_first(client):
+    """Messages newer than the last ID are yielded in chronological order."""
+    client._last_message_ids["source"] = 10
+    client._client.get_messages = AsyncMock(return_value=[make_raw(12, "b"), make_raw(11, "a")])
+
+    messages = [m async for m in client.poll_new_messages()]
+
+    assert [m.id for m in messages] == [11, 12]
+    assert client._client.get_messages.call_args.kwargs["min_id"] == 10
+    assert client._last_message_ids["source"] == 12
+
+
+@pytest.mark.asyncio
+async def test_poll_pages_back_when_batch_is_full(client, monkeypatch):
+    """A full page is followed by older pages so no message between polls is skipped."""
+    monkeypatch.setattr(telegram_client, "MAX_MESSAGES_PER_POLL", 2)
+    client._last_message_ids["source"] = 10
+    client._client.get_messages = AsyncMock(side_effect=[
+        [make_raw(15), make_raw(14)],
+        [make_raw(13), make_raw(12)],
+        [make_raw(11)],
+    ])
+
+    messages = [m async for m in client.poll_new_messages()]
+
+    assert [m.id for m in messages] == [11, 12, 13, 14, 15]
+    assert client._client.get_messages.call_args.kwargs["max_id"] == 12
+    assert client._last_message_ids["source"] == 15
+
+
+@pytest.mark.asyncio
+async def test_poll_warns_when_catchup_limit_skips_messages(client, monkeypatch, caplog):
+    """Messages older than MAX_CATCHUP_MESSAGES are skipped with a warning naming the range."""
+    monkeypatch.setattr(telegram_client, "MAX_MESSAGES_PER_POLL", 2)
+    monkeypatch.setattr(telegram_client, "MAX_CATCHUP_MESSAGES", 4)
+    client._last_message_ids["source"] = 10
+    client._client.get_messages = AsyncMock(side_effect=[
+        [make_raw(20), make_raw(19)],
+        [make_raw(18), make_raw(17)],
+    ])
+
+    messages = [m async for m in client.poll_new_messages()]
+
+    assert [m.id for m in messages] == [17, 18, 19, 20]
+    assert "Catch-up limit reached for @source: skipped IDs 11-16" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_poll_failing_channel_does_not_block_others(client):
+    """Channels are fetched together; one failure only skips that channel."""
+    client.source_channels = ["broken", "source"]
+    client._last_message_ids.update(broken=1, source=10)
+
+    async def get_entity(channel):
+        if channel == "broken":
+            raise ValueError("boom")
+        return channel
+
+    client._client.get_entity = AsyncMock(side_effect=get_entity)
+    client._client.get_messages = AsyncMock(return_value=[make_raw(11, "a")])
+
+    messages = [m async for m in client.poll_new_messages()]
+
+    assert [(m.channel, m.id) for m in messages] == [("source", 11)]
+    assert client._last_message_ids["broken"] == 1
+
+
+@pytest.mark.asyncio
+async def test_send_message_retries_after_flood_wait(client, monkeypatch):
+    """FloodWaitError triggers one back-off of the requested length and a retry."""
+    client._send_semaphore = asyncio.Semaphore(1)
+
+    async def check_released(seconds):
+        # Other sends may proceed while this one waits out the flood
+        assert not client._send_semaphore.locked()
+
+    sleep = AsyncMock(side_effect=check_released)
+    monkeypatch.setattr(telegram_client.asyncio, "sleep", sleep)
+    client._client.send_message = AsyncMock(
+        side_effect=[FloodWaitError(request=None, capture=7), None]
+    )
+
+    assert await client.send_message("alert") is True
+    sleep.assert_awaited_once_with(7)
+    assert client._client.send_message.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_poll_resolves_entity_once(client):
+    """Channel entity is resolved on first poll and reused afterwards."""
+    client._client.get_messages = AsyncMock(return_value=[make_raw(10)])
+
+    [m async for m in client.poll_new_messages()]
+    [m async for m in client.poll_new_messages()]
+
+    client._client.get_entity.assert_awaited_once_with("source")
+
+
+@pytest.mark.asyncio
+async def test_message_handler_wraps_pushed_messages(client):
+    """NewMessage events from source channels are passed on as IncomingMessage."""
+    entity = PeerChannel(channel_id=123)
+    client._entities["source"] = entity
+    client._client.add_event_handler = MagicMock()
+    received = []
+
+    async def callback(message):
+        received.append(message)
+
+    client.add_message_handler(callback)
+    handler = client._client.add_event_handler.call_args[0][0]
+    event = MagicMock(chat_id=get_peer_id(entity), message=make_raw(42, "text"))
+    await handler(event)
+
+    assert [(m.id, m.channel) for m in received] == [(42, "source")]
+    assert client._last_message_ids["source"] == 42
+
+
+@pytest.mark.asyncio
+async def test_push_during_catchup_poll_is_not_repeated_or_rewound(client):
+    """Pushes arriving while a poll fetches are not yielded again and the offset never moves back."""
+    entity = PeerChannel(channel_id=123)
+    client._entities["source"] = entity
+    client._client.add_event_handler = MagicMock()
+    client._last_message_ids["source"] = 100
+    received = []
+
+    async def callback(message):
+        received.append(message.id)
+
+    client.add_message_handler(callback)
+    handler = client._client.add_event_handler.call_args[0][0]
+
+    async def get_messages(entity_, **kwargs):
+        # 101-103 were posted while disconnected; 104 and 105 are pushed mid-fetch
+        for msg_id in (104, 105):
+            await handler(MagicMock(chat_id=get_peer_id(entity), message=make_raw(msg_id)))
+        return [make_raw(msg_id) for msg_id in (105, 104, 103, 102, 101)]
+
+    client._client.get_messages = get_messages
+    async for message in client.poll_new_messages():
+        received.append(message.id)
+
+    assert received == [104, 105, 101, 102, 103]
+    assert client._last_message_ids["source"] == 105
+
+    # A message the next poll already yielded is not delivered again by its late push
+    client._client.get_messages = AsyncMock(return_value=[make_raw(106)])
+    async for message in client.poll_new_messages():
+        received.append(message.id)
+    await handler(MagicMock(chat_id=get_peer_id(entity), message=make_raw(106)))
+    assert received == [104, 105, 101, 102, 103, 106]
+
+
+@pytest.mark.asyncio
+async def test_offsets_persisted_and_restored(tmp_path):
+    """Last message IDs are saved after a poll and loaded by the next client."""
+    offsets_file = str(tmp_path / "offsets.json")
+
+    def make_client():
+        ingest = TelegramIngestClient(
+            api_id=1,
+            api_hash="hash",
+            session_string="",
+            source_channels=["source"],
+            target_channel="target",
+            offsets_file=offsets_file,
+        )
+        ingest._client = MagicMock()
+        ingest._client.get_entity = AsyncMock(return_value=object())
+        ingest.ensure_connected = AsyncMock(return_value=True)
+        return ingest
+
+    first = make_client()
+    first._last_message_ids["source"] = 10
+    first._client.get_messages = AsyncMock(return_value=[make_raw(11, "a")])
+    [m async for m in first.poll_new_messages()]
+    await first.flush_offsets()
+
+    assert make_client()._last_message_ids == {"source": 11}
+
+
+@pytest.mark.asyncio
+async def test_offsets_survive_quick_restart_after_quiet_period(tmp_path):
+    """Shutdown stamps saved_at, so offsets unchanged for a while still load after a restart."""
+    offsets_file = tmp_path / "offsets.json"
+    stale = time.time() - 3600
+    offsets_file.write_text(json.dumps({"saved_at": stale, "offsets": {"source": 11}}))
+    os.utime(offsets_file, (stale, stale))
+
+    def make_client():
+        return TelegramIngestClient(
+            api_id=1,
+            api_hash="hash",
+            session_string="",
+            source_channels=["source"],
+            target_channel="target",
+            offsets_file=str(offsets_file),
+        )
+
+    # Last written an hour ago: too old to trust
+    assert make_client()._last_message_ids == {}
+
+    running = make_client()
+    running._last_message_ids["source"] = 11
+    await running.flush_offsets()  # on shutdown, with no pending write
+
+    assert make_client()._last_message_ids == {"source": 11}
+
+
+@pytest.mark.asyncio
+async def test_send_message_uses_resolved_target(client):
+    """Alerts go to the target entity resolved at startup, not the username."""
+    target = MagicMock()
+    client._client.get_entity = AsyncMock(return_value=target)
+    client._client.send_message = AsyncMock()
+
+    await client.validate_channels()
+    assert await client.send_message("alert") is True
+
+    assert client._client.send_message.call_args.args[0] is target
+
+
+@pytest.mark.asyncio
+async def test_offsets_save_is_debounced(tmp_path, monkeypatch):
+    """A burst of offset updates schedules a single delayed write."""
+    monkeypatch.setattr(telegram_client, "OFFSETS_FLUSH_DELAY", 0)
+    ingest = TelegramIngestClient(
+        api_id=1,
+        api_hash="hash",
+        session_string="",
+        source_channels=["source"],
+        target_channel="target",
+        offsets_file=str(tmp_path / "offsets.json"),
+    )
+    ingest._save_offsets = MagicMock()
+
+    for msg_id in (1, 2, 3):
+        ingest._last_message_ids["source"] = msg_id
+        ingest._persist_offsets()
+    await ingest._offsets_flush
+
+    ingest._save_offsets.assert_called_once_with({"source": 3})
@@ -6,12 +6,15 @@ Priority: Visicom -> OpenCage -> Nominatim
 import os
 import json
 import logging
-from typing import Optional, Dict
+from collections import OrderedDict
+from typing import Optional, Dict, Tuple
 import asyncio
+import threading
+import time
 
 import aiohttp
 
-from core.constants import CITIES, CITY_TO_REGION
+from core.constants import CITY_FORMS, APOSTROPHES
 
 logger = logging.getLogger(__name__)
 
@@ -20,45 +23,263 @@ try:
 except ImportError:
     get_metrics = None
 
+# Bound once; the metrics singleton never changes
+_metrics = get_metrics() if get_metrics else None
+
 # API keys
 VISICOM_API_KEY = os.environ.get('VISICOM_API_KEY', '')
 OPENCAGE_API_KEY = os.environ.get('OPENCAGE_API_KEY', '')
 
-# Cache for geocoding results
+# Shared HTTP session (keep-alive across geocoder calls), bound to the loop that created it
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+_HTTP_TIMEOUT = aiohttp.ClientTimeout(total=5)
+_HTTP_HEADERS = {'User-Agent': 'TelegramForwarder/2.0'}  # required by Nominatim usage policy
+# Connection pool: cache DNS for an hour, keep idle connections open between bursts,
+# at most 2 parallel connections per geocoder host (Nominatim allows ~1 req/s)
+_HTTP_CONNECTOR_OPTIONS = {'limit': 20, 'limit_per_host': 2, 'ttl_dns_cache': 3600, 'keepalive_timeout': 75}
+
+# Cache for geocoding results (insertion order = age, oldest first)
 _cache: Dict[str, Optional[str]] = {}
+_cache_times: Dict[str, float] = {}  # city -> wall-clock time the result was stored
+_cache_generation = 0  # bumped when a stored mapping changes or goes away; memoised parsers key on it
 _cache_file = os.environ.get('GEOCODE_CACHE_FILE', 'geocode_cache.json')
+_cache_write_lock = threading.Lock()
+CACHE_TTL = int(os.environ.get('GEOCODE_CACHE_TTL', str(30 * 86400)))
+CACHE_MAX_ENTRIES = int(os.environ.get('GEOCODE_CACHE_MAX', '10000'))
+# New results are written at most once per this many seconds
+CACHE_FLUSH_DELAY = 30
+_cache_flush: Optional[asyncio.Task] = None
+
+# Recent API misses: city -> monotonic time of the failed lookup (oldest first)
+_negative_cache: OrderedDict[str, float] = OrderedDict()
+NEGATIVE_CACHE_TTL = int(os.environ.get('GEOCODE_NEGATIVE_TTL', '3600'))
+
+# API lookups in progress: (city, hint) -> future shared by concurrent callers
+_inflight: Dict[tuple, asyncio.Future] = {}
+
+# Obvious non-cities, rejected before any lookup
+_GARBAGE_WORDS = frozenset({
+    'на', 'над', 'під', 'до', 'від', 'рух', 'курс', 'курсом', 'берег', 'берегом',
+    'море', 'морем', 'шт', 'кам', 'сам', 'центр', 'напрямку',
+})
 
 
 def _load_cache():
-    """Load cache from disk."""
-    global _cache
+    """Load cache from disk, dropping expired entries."""
     try:
         if os.path.exists(_cache_file):
             with open(_cache_file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
-                for k, v in data.items():
-                    if isinstance(v, dict):
-                        _cache[k] = v.get('region')
-                    else:
-                        _cache[k] = v
+            now = time.time()
+            entries = []
+            for k, v in data.items():
+                if isinstance(v, dict):
+                    stored_at = v.get('ts') or now
+                    if now - stored_at > CACHE_TTL:
+                        continue
+                    entries.append((stored_at, k, v.get('region')))
+                else:
+                    # Old format without timestamps
+                    entries.append((now, k, v))
+            entries.sort(key=lambda e: e[0])
+            for stored_at, k, region in entries[-CACHE_MAX_ENTRIES:]:
+                _cache[k] = region
+                _cache_times[k] = stored_at
             logger.info(f"Geocode cache loaded: {len(_cache)} entries")
     except Exception as e:
         logger.warning(f"Failed to load geocode cache: {e}")
 
 
-def _save_cache():
-    """Save cache to disk."""
+def _cache_snapshot() -> Dict[str, dict]:
+    """Copy cache in on-disk format: city -> {region, ts}."""
+    now = time.time()
+    return {k: {'region': v, 'ts': _cache_times.get(k, now)} for k, v in _cache.items()}
+
+
+def _save_cache(snapshot: Dict[str, dict] = None):
+    """Save cache (or a snapshot of it) to disk."""
+    data = _cache_snapshot() if snapshot is None else snapshot
     try:
-        with open(_cache_file, 'w', encoding='utf-8') as f:
-            json.dump(_cache, f, ensure_ascii=False, indent=2)
+        with _cache_write_lock:
+            with open(_cache_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
     except Exception as e:
         logger.warning(f"Failed to save geocode cache: {e}")
 
 
+async def _save_cache_async():
+    """Save cache to disk in a worker thread (keeps event loop responsive)."""
+    await asyncio.to_thread(_save_cache, _cache_snapshot())
+
+
+def _schedule_cache_save() -> None:
+    """Schedule a debounced cache save (a burst of lookups causes one write)."""
+    global _cache_flush
+    if _cache_flush is None or _cache_flush.done():
+        _cache_flush = asyncio.create_task(_flush_cache_later())
+
+
+async def _flush_cache_later():
+    global _cache_flush
+    await asyncio.sleep(CACHE_FLUSH_DELAY)
+    _cache_flush = None
+    await _save_cache_async()
+
+
+async def flush_cache() -> None:
+    """Write pending cache changes now (call on shutdown)."""
+    global _cache_flush
+    if _cache_flush is None or _cache_flush.done():
+        return
+    _cache_flush.cancel()
+    _cache_flush = None
+    await _save_cache_async()
+
+
+def _bump_cache_generation() -> None:
+    global _cache_generation
+    _cache_generation += 1
+
+
+def cache_generation() -> int:
+    """
+    Counter that changes when a cached city changes region, expires or is evicted.
+    
+    New cities do not change it, so results memoised under it may miss a
+    region learned later (the dispatcher still enriches those events).
+    """
+    return _cache_generation
+
+
+def _cache_has(key: str) -> bool:
+    """Check that key is cached and younger than CACHE_TTL (expired entries are dropped)."""
+    if key not in _cache:
+        return False
+    stored_at = _cache_times.get(key)
+    if stored_at is not None and time.time() - stored_at > CACHE_TTL:
+        del _cache[key]
+        del _cache_times[key]
+        _bump_cache_generation()
+        return False
+    return True
+
+
+def _cache_put(key: str, region: Optional[str]) -> None:
+    """Store result, evicting the oldest entries beyond CACHE_MAX_ENTRIES."""
+    if key in _cache and _cache.pop(key) != region:
+        _bump_cache_generation()
+    _cache[key] = region
+    _cache_times[key] = time.time()
+    while len(_cache) > CACHE_MAX_ENTRIES:
+        oldest = next(iter(_cache))
+        del _cache[oldest]
+        _cache_times.pop(oldest, None)
+        _bump_cache_generation()
+
+
 # Load cache on import
 _load_cache()
 
 
+def _close_stale_session(session: aiohttp.ClientSession, session_loop) -> None:
+    """Release a session left over from another event loop."""
+    if session_loop is not None and session_loop.is_running():
+        # Still serving another thread: close it there
+        asyncio.run_coroutine_threadsafe(session.close(), session_loop)
+        return
+    # Its loop has stopped: the connector cannot be closed from this one.
+    # close_session() should have run before that loop shut down.
+    logger.debug("Dropping HTTP session left over from a stopped event loop")
+
+
+def _get_session() -> aiohttp.ClientSession:
+    """Return shared HTTP session for the running event loop, creating it on first use."""
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        # A session from another (possibly closed) loop cannot be reused here
+        if _session is not None and not _session.closed:
+            _close_stale_session(_session, _session_loop)
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(**_HTTP_CONNECTOR_OPTIONS),
+            timeout=_HTTP_TIMEOUT,
+            headers=_HTTP_HEADERS,
+        )
+        _session_loop = loop
+    return _session
+
+
+async def close_session() -> None:
+    """Close shared HTTP session (call on shutdown)."""
+    global _session, _session_loop
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+    _session_loop = None
+
+
+def _is_recent_miss(cache_key: str) -> bool:
+    """Check if all geocoders failed for this key within NEGATIVE_CACHE_TTL."""
+    failed_at = _negative_cache.get(cache_key)
+    if failed_at is None:
+        return False
+    if time.monotonic() - failed_at < NEGATIVE_CACHE_TTL:
+        return True
+    del _negative_cache[cache_key]
+    return False
+
+
+def _negative_put(cache_key: str) -> None:
+    """Record a miss, dropping expired misses and the oldest beyond CACHE_MAX_ENTRIES."""
+    now = time.monotonic()
+    _negative_cache[cache_key] = now
+    _negative_cache.move_to_end(cache_key)
+    while _negative_cache and (
+        len(_negative_cache) > CACHE_MAX_ENTRIES
+        or now - next(iter(_negative_cache.values())) >= NEGATIVE_CACHE_TTL
+    ):
+        _negative_cache.popitem(last=False)
+
+
+def _city_key(city: str) -> str:
+    """Lookup/cache key: lowercased, with apostrophes unified ("Слов’янськ" == "Слов'янськ")."""
+    return city.lower().translate(APOSTROPHES)
+
+
+def _local_entry(city_lower: str) -> Optional[Tuple[str, str]]:
+    """Look up (CITIES name, region), tolerating case, declension and trailing punctuation."""
+    # CITY_FORMS holds every CITIES key lowercased plus its oblique
+    # forms ("харкова", "полтаву") - one lookup covers all of them
+    entry = CITY_FORMS.get(city_lower)
+    if entry is None:
+        # "Бровари," -> "бровари"
+        stripped = city_lower.rstrip('.,;:!?')
+        if stripped != city_lower:
+            entry = CITY_FORMS.get(stripped)
+    return entry
+
+
+def _local_region(city_lower: str) -> Optional[str]:
+    entry = _local_entry(city_lower)
+    return entry[1] if entry else None
+
+
+def resolve_city(city: str, hint: str = None) -> Tuple[str, Optional[str]]:
+    """
+    Like get_region_for_city, but also returns the city name to emit.
+
+    A city found in the local dictionary comes back in its CITIES spelling
+    ("Полтаву" -> "Полтава"); any other name is returned unchanged.
+    """
+    if not city:
+        return city, None
+    entry = _local_entry(_city_key(city))
+    if entry:
+        return entry
+    return city, get_region_for_city(city, hint)
+
+
 def get_region_for_city(city: str, hint: str = None) -> Optional[str]:
     """
     Get region for a city name.
@@ -79,16 +300,14 @@ def get_region_for_city(city: str, hint: str = None) -> Optional[str]:
         return None
     
     # 1. Check local dictionary (fast path)
-    if city in CITIES:
-        return CITIES[city]
-    city_lower = city.lower()
-    region = CITY_TO_REGION.get(city_lower)
+    city_lower = _city_key(city)
+    region = _local_region(city_lower)
     if region:
         return region
     
     # 2. Check cache
     cache_key = city_lower
-    if cache_key in _cache:
+    if _cache_has(cache_key):
         return _cache[cache_key]
     
     # 3. Return hint if provided
@@ -103,19 +322,17 @@ def geocode_city_sync(city: str, hint_region: str = None) -> Optional[str]:
     if not city:
         return None
     
-    city_lower = city.lower().strip()
+    city_lower = _city_key(city).strip()
     if len(city) < 3:
         return None
     
     # Check local dictionary
-    if city in CITIES:
-        return CITIES[city]
-    region = CITY_TO_REGION.get(city_lower)
+    region = _local_region(city_lower)
     if region:
         return region
     
     # Check cache
-    if city_lower in _cache:
+    if _cache_has(city_lower):
         return _cache[city_lower]
     
     return hint_region
@@ -126,7 +343,7 @@ async def geocode_city(city: str, hint_region: str = None) -> Optional[str]:
     Geocode city using external API.
     
     Uses OpenCage first, then Nominatim as fallback.
-    Results are cached.
+    Results are cached; concurrent lookups of the same city share one request.
     
     Args:
         city: City name
@@ -139,13 +356,11 @@ async def geocode_city(city: str, hint_region: str = None) -> Optional[str]:
         return None
     
     # Pre-filter garbage before any lookup
-    city_lower = city.lower().strip()
+    city_lower = _city_key(city).strip()
     if len(city) < 3:
         return None
     # Skip obvious non-cities
-    garbage_words = ('на', 'над', 'під', 'до', 'від', 'рух', 'курс', 'курсом', 'берег', 'берегом', 
-                     'море', 'морем', 'шт', 'кам', 'сам', 'центр', 'напрямку')
-    if city_lower in garbage_words:
+    if city_lower in _GARBAGE_WORDS:
         return None
     # Skip region names
     if 'область' in city_lower or city_lower.endswith('щина') or city_lower.endswith('ська'):
@@ -156,47 +371,65 @@ async def geocode_city(city: str, hint_region: str = None) -> Optional[str]:
     # Check local first
     result = get_region_for_city(city, hint_region)
     if result:
-        if get_metrics:
-            get_metrics().geocode_cache_hit += 1
+        if _metrics:
+            _metrics.geocode_cache_hit += 1
         return result
 
     cache_key = city_lower
+    if _is_recent_miss(cache_key):
+        if _metrics:
+            _metrics.geocode_cache_hit += 1
+        return None
     
+    # Concurrent lookups of the same city share one set of API requests
+    inflight_key = (cache_key, hint_region)
+    pending = _inflight.get(inflight_key)
+    if pending is None:
+        pending = asyncio.ensure_future(_geocode_api(city, hint_region, cache_key))
+        _inflight[inflight_key] = pending
+        pending.add_done_callback(lambda _: _inflight.pop(inflight_key, None))
+    # Shielded so one cancelled caller does not cancel the lookup for the others
+    return await asyncio.shield(pending)
+
+
+async def _geocode_api(city: str, hint_region: Optional[str], cache_key: str) -> Optional[str]:
+    """Query geocoders in priority order and cache the result."""
     # Try Visicom first (Ukrainian API, best for Ukrainian cities)
     if VISICOM_API_KEY:
-        if get_metrics:
-            get_metrics().geocode_api_called += 1
+        if _metrics:
+            _metrics.geocode_api_called += 1
         result = await _visicom_geocode(city, hint_region)
         if result:
-            _cache[cache_key] = result
-            _save_cache()
+            _cache_put(cache_key, result)
+            _schedule_cache_save()
             logger.info(f"Visicom: {city} -> {result}")
             return result
     
     # Fallback to OpenCage
     if OPENCAGE_API_KEY:
-        if get_metrics:
-            get_metrics().geocode_api_called += 1
+        if _metrics:
+            _metrics.geocode_api_called += 1
         result = await _opencage_geocode(city, hint_region)
         if result:
-            _cache[cache_key] = result
-            _save_cache()
+            _cache_put(cache_key, result)
+            _schedule_cache_save()
             logger.info(f"OpenCage: {city} -> {result}")
             return result
     
     # Last resort: Nominatim
-    if get_metrics:
-        get_metrics().geocode_api_called += 1
+    if _metrics:
+        _metrics.geocode_api_called += 1
     result = await _nominatim_geocode(city)
     if result:
-        _cache[cache_key] = result
-        _save_cache()
+        _cache_put(cache_key, result)
+        _schedule_cache_save()
         logger.info(f"Nominatim: {city} -> {result}")
         return result
     
     # Mark as not found
-    _cache[cache_key] = None
-    _save_cache()
+    _cache_put(cache_key, None)
+    _negative_put(cache_key)
+    _schedule_cache_save()
     return None
 
 
@@ -223,64 +456,65 @@ async def _visicom_geocode(city: str, hint_region: str = None) -> Optional[str]:
             'limit': 1
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params, timeout=5) as response:
-                if response.status == 402 or response.status == 403:
-                    logger.warning("Visicom quota/auth error")
-                    return None
+        session = _get_session()
+        async with session.get(url, params=params) as response:
+            if response.status == 402 or response.status == 403:
+                logger.warning("Visicom quota/auth error")
+                return None
                 
-                if not response.ok:
-                    logger.debug(f"Visicom error: {response.status}")
-                    return None
+            if not response.ok:
+                logger.debug(f"Visicom error: {response.status}")
+                return None
                 
-                data = await response.json()
+            data = await response.json()
                 
-                # Visicom returns single Feature or FeatureCollection
-                if data.get('type') == 'Feature':
-                    props = data.get('properties', {})
-                elif data.get('type') == 'FeatureCollection':
-                    features = data.get('features', [])
-                    if not features:
-                        return None
-                    props = features[0].get('properties', {})
-                else:
+            # Visicom returns single Feature or FeatureCollection
+            if data.get('type') == 'Feature':
+                props = data.get('properties', {})
+            elif data.get('type') == 'FeatureCollection':
+                features = data.get('features', [])
+                if not features:
                     return None
+                props = features[0].get('properties', {})
+            else:
+                return None
                 
-                # Check it's in Ukraine
-                country = props.get('country', '') or props.get('country_code', '')
-                if country and 'україн' not in country.lower() and 'ua' not in country.lower():
-                    return None
+            # Check it's in Ukraine
+            country = props.get('country', '') or props.get('country_code', '')
+            country_lower = country.lower()
+            if country and 'україн' not in country_lower and 'ua' not in country_lower:
+                return None
                 
-                # Check it's a settlement, not a region/district
-                categories = props.get('categories', '')
-                obj_type = props.get('type', '') or props.get('settlement_type', '')
-                # Valid: місто, село, селище, смт, etc
-                # Invalid: область, район
-                if categories:
-                    cat_lower = categories.lower()
-                    if 'adm_region' in cat_lower or 'adm_district' in cat_lower:
-                        logger.debug(f"Visicom: {city} is region/district, skipping")
-                        return None
+            # Check it's a settlement, not a region/district
+            categories = props.get('categories', '')
+            obj_type = props.get('type', '') or props.get('settlement_type', '')
+            # Valid: місто, село, селище, смт, etc
+            # Invalid: область, район
+            if categories:
+                cat_lower = categories.lower()
+                if 'adm_region' in cat_lower or 'adm_district' in cat_lower:
+                    logger.debug(f"Visicom: {city} is region/district, skipping")
+                    return None
                 
-                # Verify result name matches query (fuzzy)
-                result_name = props.get('name', '').lower()
-                if result_name and city_lower not in result_name and result_name not in city_lower:
-                    # Allow partial match for cities like "Кам'янське" -> "кам"
-                    if len(city) > 3 and not result_name.startswith(city_lower[:3]):
-                        logger.debug(f"Visicom: name mismatch {city} != {result_name}")
-                        return None
+            # Verify result name matches query (fuzzy)
+            result_name = props.get('name', '').lower()
+            if result_name and city_lower not in result_name and result_name not in city_lower:
+                # Allow partial match for cities like "Кам'янське" -> "кам"
+                if len(city) > 3 and not result_name.startswith(city_lower[:3]):
+                    logger.debug(f"Visicom: name mismatch {city} != {result_name}")
+                    return None
                 
-                # Get region from level1 (область)
-                region = props.get('level1', '')
+            # Get region from level1 (область)
+            region = props.get('level1', '')
                 
-                # Special case: Київ (no level1, it's a special city)
-                if not region:
-                    name = props.get('name', '')
-                    if name.lower() == 'київ':
-                        region = 'Київська область'
+            # Special case: Київ (no level1, it's a special city)
+            if not region:
+                name = props.get('name', '')
+                if name.lower() == 'київ':
+                    region = 'Київська область'
                 
-                if region:
-                    return _format_region(region)
+            if region:
+                return _format_region(region)
         
     except asyncio.TimeoutError:
         logger.debug(f"Visicom timeout for {city}")
@@ -315,43 +549,43 @@ async def _opencage_geocode(city: str, hint_region: str = None) -> Optional[str]
             'language': 'uk'
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params, timeout=5) as response:
-                if response.status == 402:
-                    logger.warning("OpenCage quota exceeded")
-                    return None
+        session = _get_session()
+        async with session.get(url, params=params) as response:
+            if response.status == 402:
+                logger.warning("OpenCage quota exceeded")
+                return None
                 
-                if not response.ok:
-                    return None
+            if not response.ok:
+                return None
                 
-                data = await response.json()
-                results = data.get('results', [])
+            data = await response.json()
+            results = data.get('results', [])
                 
-                if not results:
-                    return None
+            if not results:
+                return None
                 
-                components = results[0].get('components', {})
-                if components.get('country_code', '').lower() != 'ua':
-                    return None
+            components = results[0].get('components', {})
+            if components.get('country_code', '').lower() != 'ua':
+                return None
                 
-                # Check it's a settlement type, not region/district
-                obj_type = components.get('_type', '')
-                if obj_type in ('state', 'county', 'state_district'):
-                    logger.debug(f"OpenCage: {city} is {obj_type}, skipping")
-                    return None
+            # Check it's a settlement type, not region/district
+            obj_type = components.get('_type', '')
+            if obj_type in ('state', 'county', 'state_district'):
+                logger.debug(f"OpenCage: {city} is {obj_type}, skipping")
+                return None
                 
-                # Check result matches query
-                result_city = components.get('city', '') or components.get('town', '') or components.get('village', '')
-                if result_city:
-                    result_lower = result_city.lower()
-                    if city_lower not in result_lower and result_lower not in city_lower:
-                        if len(city) > 3 and not result_lower.startswith(city_lower[:3]):
-                            logger.debug(f"OpenCage: name mismatch {city} != {result_city}")
-                            return None
+            # Check result matches query
+            result_city = components.get('city', '') or components.get('town', '') or components.get('village', '')
+            if result_city:
+                result_lower = result_city.lower()
+                if city_lower not in result_lower and result_lower not in city_lower:
+                    if len(city) > 3 and not result_lower.startswith(city_lower[:3]):
+                        logger.debug(f"OpenCage: name mismatch {city} != {result_city}")
+                        return None
                 
-                state = components.get('state', '')
-                if state:
-                    return _format_region(state)
+            state = components.get('state', '')
+            if state:
+                return _format_region(state)
         
     except Exception as e:
         logger.debug(f"OpenCage error: {e}")
@@ -370,45 +604,37 @@ async def _nominatim_geocode(city: str) -> Optional[str]:
             return None
         
         url = "https://nominatim.openstreetmap.org/search"
+        # Let the server filter to Ukrainian settlements (smaller, cheaper response)
         params = {
             'q': f"{city}, Україна",
             'format': 'json',
             'addressdetails': 1,
+            'countrycodes': 'ua',
+            'featureType': 'settlement',
             'limit': 1,
             'accept-language': 'uk'
         }
-        headers = {
-            'User-Agent': 'TelegramForwarder/2.0'
-        }
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params, headers=headers, timeout=5) as response:
-                if not response.ok:
-                    return None
-                
-                data = await response.json()
-                if not data:
-                    return None
+        session = _get_session()
+        async with session.get(url, params=params) as response:
+            if not response.ok:
+                return None
                 
-                # Check it's a settlement type
-                osm_type = data[0].get('type', '')
-                osm_class = data[0].get('class', '')
-                if osm_class == 'boundary' and osm_type in ('administrative',):
-                    # Could be region/district - check addressdetails
-                    pass
+            data = await response.json()
+            if not data:
+                return None
                 
-                address = data[0].get('address', {})
+            address = data[0].get('address', {})
                 
-                # Verify we got a city/town/village, not just region
-                result_city = address.get('city', '') or address.get('town', '') or address.get('village', '')
-                if not result_city:
-                    logger.debug(f"Nominatim: {city} - no settlement in result")
-                    return None
+            # Verify we got a city/town/village, not just region
+            result_city = address.get('city', '') or address.get('town', '') or address.get('village', '')
+            if not result_city:
+                logger.debug(f"Nominatim: {city} - no settlement in result")
+                return None
                 
-                state = address.get('state', '')
+            state = address.get('state', '')
                 
-                if state:
-                    return _format_region(state)
+            if state:
+                return _format_region(state)
         
     except asyncio.TimeoutError:
         logger.debug(f"Nominatim timeout for {city}")
@@ -16,15 +16,18 @@ class Metrics:
     events_sent: int = 0
     geocode_cache_hit: int = 0
     geocode_api_called: int = 0
+    prefilter_skipped: int = 0
 
     def log(self) -> None:
         """Log aggregated metrics."""
         logger.info(
-            "metrics events_parsed=%d events_sent=%d geocode_cache_hit=%d geocode_api_called=%d",
+            "metrics events_parsed=%d events_sent=%d geocode_cache_hit=%d geocode_api_called=%d "
+            "prefilter_skipped=%d",
             self.events_parsed,
             self.events_sent,
             self.geocode_cache_hit,
             self.geocode_api_called,
+            self.prefilter_skipped,
         )
 
 
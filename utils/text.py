@@ -4,6 +4,20 @@ Text utilities - common text processing functions.
 import re
 from typing import Optional
 
+_WHITESPACE = re.compile(r'\s+')
+_COUNT_PREFIX = re.compile(r'^(\d+)\s*х?\s*')
+_COUNT_PARENS = re.compile(r'\((\d+)х?\)')
+_CYRILLIC = re.compile(r'[а-яіїєґА-ЯІЇЄҐ]')
+# Common Telegram emoji, deleted with str.translate
+_EMOJI_TABLE = str.maketrans('', '', '💥🛸🛵⚠️❗️🔴🚀✈️👁️📡🇺🇦➡️⬅️↗️↘️↖️↙️⬆️⬇️💣🧨⚪️▪️•')
+
+# Every character regex \s matches (str.isspace), for str.strip()/lstrip() character sets;
+# spelled out because scanning all code points at import is slow
+WHITESPACE_CHARS = (
+    '\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680\u2000\u2001\u2002\u2003\u2004'
+    '\u2005\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000'
+)
+
 
 def clean_text(text: str) -> str:
     """
@@ -17,7 +31,7 @@ def clean_text(text: str) -> str:
         return ""
     
     # Normalize whitespace
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = _WHITESPACE.sub(' ', text).strip()
     
     return text
 
@@ -41,18 +55,44 @@ def extract_count(text: str) -> Optional[int]:
         return None
     
     # Try prefix format "Nх" or "N "
-    match = re.match(r'^(\d+)\s*х?\s*', text)
+    match = _COUNT_PREFIX.match(text)
     if match:
         return int(match.group(1))
     
     # Try parentheses format "(Nх)"
-    match = re.search(r'\((\d+)х?\)', text)
+    match = _COUNT_PARENS.search(text)
     if match:
         return int(match.group(1))
     
     return None
 
 
+def strip_parens(text: str) -> str:
+    """
+    Remove parenthesized groups in a single linear scan.
+    
+    An unclosed "(" drops the rest of the text:
+    - "Суми (Сумська обл.)" -> "Суми "
+    - "Суми (Сумська" -> "Суми "
+    """
+    start = text.find('(')
+    if start < 0:
+        return text
+    
+    parts = []
+    pos = 0
+    while start >= 0:
+        parts.append(text[pos:start])
+        end = text.find(')', start + 1)
+        if end < 0:
+            pos = len(text)
+            break
+        pos = end + 1
+        start = text.find('(', pos)
+    parts.append(text[pos:])
+    return ''.join(parts)
+
+
 def truncate(text: str, max_length: int = 100, suffix: str = "...") -> str:
     """
     Truncate text to max length.
@@ -73,17 +113,12 @@ def truncate(text: str, max_length: int = 100, suffix: str = "...") -> str:
 
 def is_cyrillic(text: str) -> bool:
     """Check if text contains Cyrillic characters."""
-    return bool(re.search(r'[а-яіїєґА-ЯІЇЄҐ]', text))
+    return bool(_CYRILLIC.search(text))
 
 
 def remove_emoji(text: str) -> str:
     """Remove emoji from text."""
-    # Common Telegram emoji
-    emoji_pattern = re.compile(
-        r'[💥🛸🛵⚠️❗️🔴🚀✈️👁️📡🇺🇦➡️⬅️↗️↘️↖️↙️⬆️⬇️💣🧨⚪️▪️•]',
-        flags=re.UNICODE
-    )
-    return emoji_pattern.sub('', text)
+    return text.translate(_EMOJI_TABLE)
 
 
 def normalize_apostrophe(text: str) -> str: